@@ -5,47 +5,120 @@ This helps validate the regex patterns without needing a live device.
 """
 
 import re
-from typing import Optional
+from typing import Any, Optional
+
+try:
+    # RE2 guarantees linear-time matching on untrusted console output
+    import re2 as _serial_re
+except ImportError:
+    _serial_re = re
+
+
+# Precompiled cleanup and serial number patterns (built once at import time)
+_DEL_TABLE = str.maketrans('', '', '\x08')
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]')
+
+# Values some platforms print in place of a real serial number
+_PLACEHOLDERS = frozenset(('none', 'n/a', 'unknown', ''))
+
+# Serial number patterns in priority order (earlier patterns win)
+_SERIAL_PATTERN_SOURCES = (
+    # Cisco IOS XE / Catalyst switches
+    r'Model [Nn]umber\s*:?\s*\S+\s+[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
+    r'[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
+    # Standard patterns
+    r'[Ss]erial\s+[Nn]umber\s*:?\s+(\S+)',
+    r'[Pp]rocessor [Bb]oard ID\s+(\S+)',
+    r'Chassis Serial Number\s*:?\s+(\S+)',
+    # Alternative patterns
+    r'Serial [Nn]um\s*:?\s*(\S+)',
+    r'SN\s*:?\s*(\S+)',
+)
+
+
+def _build_serial_regex(sources: tuple) -> Any:
+    """
+    Fuse the serial number patterns into a single alternation.
+
+    Each pattern's capture group is renamed to ``v<index>`` so the pattern
+    that produced a match can be identified. Every pattern is anchored to
+    the start of a line (after optional indentation) so the engine only
+    attempts matches at line starts. Flags are given inline so the same
+    pattern compiles with RE2 (when installed) or the standard library.
+    """
+    alternatives = []
+    for index, source in enumerate(sources):
+        source = source.replace(r'(\S+)', f'(?P<v{index}>\\S+)')
+        alternatives.append(f'(?:^[ \\t]*{source})')
+    pattern = '(?im)' + '|'.join(alternatives)
+    try:
+        return _serial_re.compile(pattern)
+    except Exception:
+        # Fallback: syntax RE2 does not support, use the backtracking engine
+        return re.compile(pattern)
+
+
+_SERIAL_RE = _build_serial_regex(_SERIAL_PATTERN_SOURCES)
+
+# Patterns up to this index read the System Serial Number line; nothing later
+# in the output can outrank them, so scanning stops once one matches.
+_AUTHORITATIVE_INDEX = 1
 
 
 def parse_show_version(output: str) -> Optional[str]:
     """
     Parse 'show version' output to extract serial number.
 
+    The output is cleaned and scanned line by line so that work stops as
+    soon as an authoritative 'System Serial Number' line is found, instead
+    of cleaning the whole capture up front. A two-line window lets patterns
+    that span a line break (Model Number / System Serial Number) match.
+
     Args:
         output: Output from 'show version' command
 
     Returns:
         Serial number if found, None otherwise
     """
-    # Clean up pagination artifacts
-    cleaned_output = output.replace('--More--', '').replace('-- More --', '')
-    # Remove backspace characters and ANSI escape codes
-    cleaned_output = re.sub(r'\x08+', '', cleaned_output)
-    cleaned_output = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', cleaned_output)
-
-    # Common patterns for serial number in show version output
-    patterns = [
-        # Cisco IOS XE / Catalyst switches
-        r'Model [Nn]umber\s*:?\s*\S+\s+[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
-        r'[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
-        # Standard patterns
-        r'[Ss]erial\s+[Nn]umber\s*:?\s+(\S+)',
-        r'[Pp]rocessor [Bb]oard ID\s+(\S+)',
-        r'Chassis Serial Number\s*:?\s+(\S+)',
-        # Alternative patterns
-        r'Serial [Nn]um\s*:?\s*(\S+)',
-        r'SN\s*:?\s*(\S+)',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, cleaned_output, re.IGNORECASE)
-        if match:
-            serial = match.group(1).strip()
+    # Keep the candidate from the highest priority pattern so results match
+    # a pattern-by-pattern search over the full output.
+    best_index = None
+    best_serial = None
+    previous_line = ''
+
+    # Only run the cleanup steps the output actually needs
+    has_pagination = '--More--' in output or '-- More --' in output
+    has_backspace = '\x08' in output
+    has_escape = '\x1b' in output
+
+    for line in output.splitlines():
+        # Clean up pagination artifacts, backspace characters and ANSI codes
+        if has_pagination:
+            line = line.replace('--More--', '').replace('-- More --', '')
+        if has_backspace:
+            line = line.translate(_DEL_TABLE)
+        if has_escape:
+            line = _ANSI_RE.sub('', line)
+
+        for match in _SERIAL_RE.finditer(f"{previous_line}\n{line}"):
+            name, serial = next(
+                (name, value) for name, value in match.groupdict().items() if value is not None
+            )
+            index = int(name[1:])
+            if best_index is not None and index >= best_index:
+                continue
+            serial = serial.strip()
             # Filter out placeholder values
-            if serial and serial.lower() not in ['none', 'n/a', 'unknown', '']:
-                print(f"✓ Matched pattern: {pattern}")
-                return serial
+            if serial and serial.lower() not in _PLACEHOLDERS:
+                best_index, best_serial = index, serial
+
+        if best_index is not None and best_index <= _AUTHORITATIVE_INDEX:
+            break
+        previous_line = line
+
+    if best_serial is not None:
+        print(f"✓ Matched pattern: {_SERIAL_PATTERN_SOURCES[best_index]}")
+        return best_serial
 
     return None
 
@@ -0,0 +1,250 @@
+"""
+Tests for the terminal server and console SSH managers.
+
+Channels are replaced with scripted fakes, so no SSH connection is made.
+"""
+
+import subprocess
+from typing import List, Optional, Tuple
+
+import pytest
+
+from ztp.ssh_manager import CommandExecutionError, ConsoleManager, SSHManager
+
+
+class FakeExecChannel:
+    """Exec channel that replays canned pmshell output."""
+
+    def __init__(self, output: str, exited: bool = False) -> None:
+        self.buffer = output.encode()
+        self.exited = exited
+        self.closed = False
+        self.eof_received = False
+        self.sent: List[str] = []
+        self.commands: List[str] = []
+
+    def get_pty(self) -> None:
+        pass
+
+    def exec_command(self, command: str) -> None:
+        self.commands.append(command)
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def exit_status_ready(self) -> bool:
+        return self.exited
+
+    def recv_ready(self) -> bool:
+        return bool(self.buffer)
+
+    def recv(self, size: int) -> bytes:
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def send(self, data: str) -> int:
+        self.sent.append(data)
+        return len(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self, channel: FakeExecChannel) -> None:
+        self.channel = channel
+
+    def open_session(self) -> FakeExecChannel:
+        return self.channel
+
+
+class FakeClient:
+    def __init__(self, channel: FakeExecChannel) -> None:
+        self.transport = FakeTransport(channel)
+
+    def get_transport(self) -> FakeTransport:
+        return self.transport
+
+
+def _console(channel: FakeExecChannel) -> ConsoleManager:
+    """Create a console manager connected through a fake client."""
+    console = ConsoleManager('192.0.2.2', 'ts', 'ts-pass')
+    console.client = FakeClient(channel)  # type: ignore[assignment]
+    console._connected = True
+    return console
+
+
+def _record_fallback(console: ConsoleManager, monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Replace connect_to_console with a stub recording the ports it is called with."""
+    ports: List[int] = []
+    monkeypatch.setattr(console, 'connect_to_console', ports.append)
+    return ports
+
+
+def test_direct_console_attached(monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FakeExecChannel("Connected to port 5. Escape character is '~.'\r\n")
+    console = _console(channel)
+    fallback = _record_fallback(console, monkeypatch)
+
+    console.connect_to_console_direct(5)
+
+    assert channel.commands == ['pmshell 5']
+    assert console.channel is channel
+    assert not channel.closed
+    assert fallback == []
+
+
+def test_direct_console_rejected_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FakeExecChannel("pmshell: unrecognized argument '5'\r\n", exited=True)
+    console = _console(channel)
+    fallback = _record_fallback(console, monkeypatch)
+
+    console.connect_to_console_direct(5)
+
+    assert channel.closed
+    assert console.channel is None
+    assert fallback == [5]
+
+
+def test_direct_console_refused_port_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FakeExecChannel("Port 5 not connected\r\n")
+    console = _console(channel)
+    fallback = _record_fallback(console, monkeypatch)
+
+    with pytest.raises(CommandExecutionError):
+        console.connect_to_console_direct(5)
+
+    assert channel.closed
+    assert fallback == []
+
+
+def test_direct_console_menu_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FakeExecChannel(" 1: sw1-console\r\n 2: sw2-console\r\nConnect to port > ")
+    console = _console(channel)
+    fallback = _record_fallback(console, monkeypatch)
+
+    console.connect_to_console_direct(5)
+
+    assert channel.closed
+    assert console.channel is None
+    assert fallback == [5]
+
+
+def test_direct_console_device_prompt_is_not_menu(monkeypatch: pytest.MonkeyPatch) -> None:
+    channel = FakeExecChannel("\r\nSwitch>")
+    console = _console(channel)
+    fallback = _record_fallback(console, monkeypatch)
+
+    console.connect_to_console_direct(5)
+
+    assert console.channel is channel
+    assert fallback == []
+
+
+class FakeExitChannel:
+    def __init__(self, exit_code: int) -> None:
+        self.exit_code = exit_code
+
+    def recv_exit_status(self) -> int:
+        return self.exit_code
+
+
+class FakeStream:
+    def __init__(self, data: bytes, channel: FakeExitChannel) -> None:
+        self.data = data
+        self.channel = channel
+
+    def read(self) -> bytes:
+        return self.data
+
+
+class LocalExecClient:
+    """SSH client whose exec requests run in a local shell."""
+
+    def __init__(self) -> None:
+        self.commands: List[str] = []
+
+    def exec_command(
+        self, command: str, timeout: Optional[float] = None, get_pty: bool = False
+    ) -> Tuple[None, FakeStream, FakeStream]:
+        self.commands.append(command)
+        result = subprocess.run(command, shell=True, capture_output=True, timeout=timeout)
+        channel = FakeExitChannel(result.returncode)
+        return None, FakeStream(result.stdout, channel), FakeStream(result.stderr, channel)
+
+
+def _ssh_manager() -> Tuple[SSHManager, LocalExecClient]:
+    """Create an SSH manager whose commands run locally."""
+    client = LocalExecClient()
+    manager = SSHManager('192.0.2.1', 'jump', password='jump-pass')
+    manager.client = client  # type: ignore[assignment]
+    manager._connected = True
+    return manager, client
+
+
+def test_execute_batch_splits_output_per_command() -> None:
+    manager, client = _ssh_manager()
+
+    results = manager.execute_batch(['echo one', 'true', 'printf two'])
+
+    assert len(client.commands) == 1
+    assert results == [('one\n', '', 0), ('', '', 0), ('two', '', 0)]
+
+
+def test_execute_batch_stops_at_failing_command() -> None:
+    manager, _ = _ssh_manager()
+
+    results = manager.execute_batch(
+        ['echo before', 'ls /nonexistent-ztp-path', 'echo after']
+    )
+
+    assert [(out, exit_code) for out, _, exit_code in results[:1]] == [('before\n', 0)]
+    assert len(results) == 2
+    out, err, exit_code = results[1]
+    assert out == ''
+    assert 'nonexistent-ztp-path' in err
+    assert exit_code != 0
+
+
+def test_execute_batch_reports_command_that_exits_the_shell() -> None:
+    manager, _ = _ssh_manager()
+
+    results = manager.execute_batch(
+        ['echo before', 'echo broken; echo oops >&2; exit 3', 'echo after']
+    )
+
+    assert results == [('before\n', '', 0), ('broken\n', 'oops\n', 3)]
+
+
+def test_execute_batch_continues_after_failure() -> None:
+    manager, _ = _ssh_manager()
+
+    results = manager.execute_batch(
+        ['echo before', 'false', 'echo after'], stop_on_error=False
+    )
+
+    assert results == [('before\n', '', 0), ('', '', 1), ('after\n', '', 0)]
+
+
+def test_execute_batch_keeps_stderr_with_its_command() -> None:
+    manager, _ = _ssh_manager()
+
+    results = manager.execute_batch([
+        'echo out1; echo err1 >&2; echo out1b',
+        'echo err2 >&2',
+        'echo out3; echo err3 >&2',
+    ])
+
+    assert results == [
+        ('out1\nout1b\n', 'err1\n', 0),
+        ('', 'err2\n', 0),
+        ('out3\n', 'err3\n', 0),
+    ]
+
+
+def test_execute_batch_reports_exit_after_earlier_failure() -> None:
+    manager, _ = _ssh_manager()
+
+    results = manager.execute_batch(['false', 'exit 4', 'echo after'], stop_on_error=False)
+
+    assert results == [('', '', 1), ('', '', 4)]
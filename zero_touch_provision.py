@@ -22,27 +22,14 @@ import sys
 import os
 import argparse
 import logging
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # Add parent directory to path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    print("ERROR: python-dotenv not installed. Run: pip install -r requirements.txt")
-    sys.exit(1)
-
-try:
-    from ztp import ProvisioningOrchestrator
-    from ztp.orchestrator import ProvisioningError
-except ImportError as e:
-    print(f"ERROR: Failed to import ZTP modules: {e}")
-    print("Ensure all dependencies are installed: pip install -r requirements.txt")
-    sys.exit(1)
-
 
 # ANSI color codes for terminal output
 class Colors:
@@ -58,61 +45,126 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Environment variables that must be set in .env
+_REQUIRED_VARS = (
+    'NETBOX_URL',
+    'NETBOX_TOKEN',
+    'JUMPHOST_IP',
+    'JUMPHOST_USERNAME',
+    'JUMPHOST_PASSWORD',
+    'TERMINAL_SERVER_IP',
+    'TERMINAL_SERVER_USERNAME',
+    'TERMINAL_SERVER_PASSWORD',
+    'FTP_SERVER_IP',
+    'FTP_USERNAME',
+    'FTP_PASSWORD',
+)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Validated runtime configuration loaded from the environment."""
+    __slots__ = (
+        'netbox_url', 'netbox_token',
+        'jumphost_ip', 'jumphost_username', 'jumphost_password',
+        'terminal_server_ip', 'terminal_server_username', 'terminal_server_password',
+        'ftp_server_ip', 'ftp_username', 'ftp_password', 'ftp_directory',
+        'verify_ssl', 'log_level', 'log_file', 'netbox_cache_dir',
+    )
+
+    netbox_url: str
+    netbox_token: str
+    jumphost_ip: str
+    jumphost_username: str
+    jumphost_password: str
+    terminal_server_ip: str
+    terminal_server_username: str
+    terminal_server_password: str
+    ftp_server_ip: str
+    ftp_username: str
+    ftp_password: str
+    ftp_directory: str
+    verify_ssl: bool
+    log_level: str
+    log_file: str
+    netbox_cache_dir: Optional[str]
+
+
+# Shared log formatter and the current logging configuration
+_LOG_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    '%Y-%m-%d %H:%M:%S'
+)
+_LOG_STATE: Dict[str, Any] = {}
+
+
 def setup_logging(log_level: str, log_file: Optional[str] = None) -> None:
     """
     Configure logging for the application.
 
+    Safe to call repeatedly: handlers are created once and only the level
+    or log file that actually changed is reconfigured.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional log file path
     """
-    # Create logs directory if it doesn't exist
-    if log_file:
-        log_dir = os.path.dirname(log_file)
-        if log_dir:
-            os.makedirs(log_dir, exist_ok=True)
-
-    # Configure root logger
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    date_format = '%Y-%m-%d %H:%M:%S'
-
-    # Set up handlers
-    handlers = []
-
-    # Console handler with color support
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(log_format, date_format))
-    handlers.append(console_handler)
-
-    # File handler if log file specified
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(log_format, date_format))
-        handlers.append(file_handler)
-
-    # Configure logging
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper(), logging.INFO),
-        format=log_format,
-        datefmt=date_format,
-        handlers=handlers
-    )
-
-    # Suppress paramiko logging noise
-    logging.getLogger('paramiko').setLevel(logging.WARNING)
-    logging.getLogger('netmiko').setLevel(logging.WARNING)
-
-
-def load_environment() -> dict:
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    if _LOG_STATE.get('level') == level and _LOG_STATE.get('log_file') == log_file:
+        return
+
+    root_logger = logging.getLogger()
+
+    # Console handler is created once and reused on later calls
+    if 'console_handler' not in _LOG_STATE:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(_LOG_FORMATTER)
+        root_logger.addHandler(console_handler)
+        _LOG_STATE['console_handler'] = console_handler
+
+        # Suppress paramiko logging noise
+        logging.getLogger('paramiko').setLevel(logging.WARNING)
+        logging.getLogger('netmiko').setLevel(logging.WARNING)
+
+    # Swap the file handler only when the log file changes
+    if log_file != _LOG_STATE.get('log_file'):
+        old_handler = _LOG_STATE.pop('file_handler', None)
+        if old_handler:
+            root_logger.removeHandler(old_handler)
+            old_handler.close()
+
+        if log_file:
+            # Create logs directory if it doesn't exist
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(_LOG_FORMATTER)
+            root_logger.addHandler(file_handler)
+            _LOG_STATE['file_handler'] = file_handler
+
+    root_logger.setLevel(level)
+    _LOG_STATE['level'] = level
+    _LOG_STATE['log_file'] = log_file
+
+
+def load_environment() -> Config:
     """
     Load and validate environment variables.
 
     Returns:
-        Dictionary of environment variables
+        Configuration built from environment variables
 
     Raises:
         ValueError: If required environment variables are missing
     """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("ERROR: python-dotenv not installed. Run: pip install -r requirements.txt")
+        sys.exit(1)
+
     # Load .env file - search in current directory, script directory, and parent
     search_paths = [
         Path.cwd() / '.env',                    # Current working directory
@@ -138,26 +190,9 @@ def load_environment() -> dict:
 
     load_dotenv(dotenv_path=env_file)
 
-    # Required environment variables
-    required_vars = [
-        'NETBOX_URL',
-        'NETBOX_TOKEN',
-        'JUMPHOST_IP',
-        'JUMPHOST_USERNAME',
-        'JUMPHOST_PASSWORD',
-        'TERMINAL_SERVER_IP',
-        'TERMINAL_SERVER_USERNAME',
-        'TERMINAL_SERVER_PASSWORD',
-        'FTP_SERVER_IP',
-        'FTP_USERNAME',
-        'FTP_PASSWORD',
-    ]
-
-    # Validate required variables
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    # Read required variables once and validate them
+    env = {var: os.getenv(var) for var in _REQUIRED_VARS}
+    missing_vars = [var for var, value in env.items() if not value]
 
     if missing_vars:
         print(f"{Colors.FAIL}ERROR: Missing required environment variables:{Colors.ENDC}")
@@ -166,24 +201,28 @@ def load_environment() -> dict:
         print(f"\nPlease update your .env file with these variables.")
         sys.exit(1)
 
+    # All required values are set from here on
+    required: Dict[str, str] = {var: value for var, value in env.items() if value}
+
     # Return environment configuration
-    return {
-        'netbox_url': os.getenv('NETBOX_URL'),
-        'netbox_token': os.getenv('NETBOX_TOKEN'),
-        'jumphost_ip': os.getenv('JUMPHOST_IP'),
-        'jumphost_username': os.getenv('JUMPHOST_USERNAME'),
-        'jumphost_password': os.getenv('JUMPHOST_PASSWORD'),
-        'terminal_server_ip': os.getenv('TERMINAL_SERVER_IP'),
-        'terminal_server_username': os.getenv('TERMINAL_SERVER_USERNAME'),
-        'terminal_server_password': os.getenv('TERMINAL_SERVER_PASSWORD'),
-        'ftp_server_ip': os.getenv('FTP_SERVER_IP'),
-        'ftp_username': os.getenv('FTP_USERNAME'),
-        'ftp_password': os.getenv('FTP_PASSWORD'),
-        'ftp_directory': os.getenv('FTP_DIRECTORY', '/srv/ftp'),
-        'verify_ssl': os.getenv('VERIFY_SSL', 'true').lower() == 'true',
-        'log_level': os.getenv('LOG_LEVEL', 'INFO'),
-        'log_file': os.getenv('LOG_FILE', './logs/provisioning.log'),
-    }
+    return Config(
+        netbox_url=required['NETBOX_URL'],
+        netbox_token=required['NETBOX_TOKEN'],
+        jumphost_ip=required['JUMPHOST_IP'],
+        jumphost_username=required['JUMPHOST_USERNAME'],
+        jumphost_password=required['JUMPHOST_PASSWORD'],
+        terminal_server_ip=required['TERMINAL_SERVER_IP'],
+        terminal_server_username=required['TERMINAL_SERVER_USERNAME'],
+        terminal_server_password=required['TERMINAL_SERVER_PASSWORD'],
+        ftp_server_ip=required['FTP_SERVER_IP'],
+        ftp_username=required['FTP_USERNAME'],
+        ftp_password=required['FTP_PASSWORD'],
+        ftp_directory=os.getenv('FTP_DIRECTORY', '/srv/ftp'),
+        verify_ssl=os.getenv('VERIFY_SSL', 'true').lower() == 'true',
+        log_level=os.getenv('LOG_LEVEL', 'INFO'),
+        log_file=os.getenv('LOG_FILE', './logs/provisioning.log'),
+        netbox_cache_dir=os.getenv('NETBOX_CACHE_DIR') or None,
+    )
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -259,28 +298,31 @@ def print_banner():
 ╚═══════════════════════════════════════════════════════════════╝
 {Colors.ENDC}
 """
-    print(banner)
+    sys.stdout.write(banner + "\n")
 
 
-def print_summary(device_name: str, console_port: int, config: dict):
+def print_summary(device_name: str, console_port: int, config: Config):
     """
     Print provisioning summary.
 
     Args:
         device_name: Device name
         console_port: Console port number
-        config: Configuration dictionary
+        config: Runtime configuration
     """
-    print(f"\n{Colors.BOLD}Provisioning Configuration:{Colors.ENDC}")
-    print(f"  Device Name:      {Colors.OKBLUE}{device_name}{Colors.ENDC}")
-    print(f"  Console Port:     {Colors.OKBLUE}{console_port}{Colors.ENDC}")
-    print(f"  NetBox URL:       {config['netbox_url']}")
-    print(f"  Jump Host:        {config['jumphost_ip']}")
-    print(f"  Terminal Server:  {config['terminal_server_ip']}")
-    print(f"  FTP Server:       {config['ftp_server_ip']}")
-    print(f"  Log Level:        {config['log_level']}")
-    print(f"  Log File:         {config['log_file']}")
-    print()
+    lines = (
+        f"\n{Colors.BOLD}Provisioning Configuration:{Colors.ENDC}",
+        f"  Device Name:      {Colors.OKBLUE}{device_name}{Colors.ENDC}",
+        f"  Console Port:     {Colors.OKBLUE}{console_port}{Colors.ENDC}",
+        f"  NetBox URL:       {config.netbox_url}",
+        f"  Jump Host:        {config.jumphost_ip}",
+        f"  Terminal Server:  {config.terminal_server_ip}",
+        f"  FTP Server:       {config.ftp_server_ip}",
+        f"  Log Level:        {config.log_level}",
+        f"  Log File:         {config.log_file}",
+    )
+    # Emit the whole summary with a single write
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
 def main() -> int:
@@ -305,10 +347,10 @@ def main() -> int:
 
     # Override log level if specified
     if args.log_level:
-        config['log_level'] = args.log_level
+        config = replace(config, log_level=args.log_level)
 
     # Setup logging
-    setup_logging(config['log_level'], config['log_file'])
+    setup_logging(config.log_level, config.log_file)
     logger = logging.getLogger(__name__)
 
     # Print summary
@@ -329,6 +371,16 @@ def main() -> int:
         print("  5. Show configuration preview without applying")
         return 0
 
+    # Import the provisioning stack only once it is actually needed, so that
+    # --help, --version and --dry-run do not pay for pynetbox/paramiko imports
+    try:
+        from ztp import ProvisioningOrchestrator
+        from ztp.orchestrator import ProvisioningError
+    except ImportError as e:
+        print(f"ERROR: Failed to import ZTP modules: {e}")
+        print("Ensure all dependencies are installed: pip install -r requirements.txt")
+        return 1
+
     # Record start time
     start_time = datetime.now()
 
@@ -339,19 +391,20 @@ def main() -> int:
         orchestrator = ProvisioningOrchestrator(
             device_name=args.device_name,
             console_port=args.console_port,
-            netbox_url=config['netbox_url'],
-            netbox_token=config['netbox_token'],
-            jumphost_ip=config['jumphost_ip'],
-            jumphost_username=config['jumphost_username'],
-            jumphost_password=config['jumphost_password'],
-            terminal_server_ip=config['terminal_server_ip'],
-            terminal_server_username=config['terminal_server_username'],
-            terminal_server_password=config['terminal_server_password'],
-            ftp_server_ip=config['ftp_server_ip'],
-            ftp_username=config['ftp_username'],
-            ftp_password=config['ftp_password'],
-            ftp_directory=config['ftp_directory'],
-            verify_ssl=config['verify_ssl']
+            netbox_url=config.netbox_url,
+            netbox_token=config.netbox_token,
+            jumphost_ip=config.jumphost_ip,
+            jumphost_username=config.jumphost_username,
+            jumphost_password=config.jumphost_password,
+            terminal_server_ip=config.terminal_server_ip,
+            terminal_server_username=config.terminal_server_username,
+            terminal_server_password=config.terminal_server_password,
+            ftp_server_ip=config.ftp_server_ip,
+            ftp_username=config.ftp_username,
+            ftp_password=config.ftp_password,
+            ftp_directory=config.ftp_directory,
+            verify_ssl=config.verify_ssl,
+            netbox_cache_dir=config.netbox_cache_dir
         )
 
     except Exception as e:
@@ -387,7 +440,7 @@ def main() -> int:
         print(f"\n{Colors.FAIL}{Colors.BOLD}PROVISIONING FAILED!{Colors.ENDC}")
         print(f"{Colors.FAIL}Error: {e}{Colors.ENDC}")
         print(f"Duration: {duration}")
-        print(f"\nCheck logs for details: {config['log_file']}")
+        print(f"\nCheck logs for details: {config.log_file}")
         return 1
 
     except KeyboardInterrupt:
@@ -403,7 +456,7 @@ def main() -> int:
         print(f"\n{Colors.FAIL}{Colors.BOLD}UNEXPECTED ERROR!{Colors.ENDC}")
         print(f"{Colors.FAIL}Error: {e}{Colors.ENDC}")
         print(f"Duration: {duration}")
-        print(f"\nCheck logs for details: {config['log_file']}")
+        print(f"\nCheck logs for details: {config.log_file}")
         return 1
 
 
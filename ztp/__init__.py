@@ -8,19 +8,43 @@ and console-based device configuration.
 Modules:
     netbox_client: NetBox API client for retrieving device configurations
     ssh_manager: SSH connection management for jump hosts and terminal servers
+    ssh_manager_async: asyncio SSH manager for concurrent multi-host commands (optional)
     orchestrator: Main provisioning workflow orchestration
 """
 
 __version__ = "1.0.0"
 __author__ = "Network Automation Team"
 
-from .netbox_client import NetBoxClient
-from .ssh_manager import SSHManager, ConsoleManager
-from .orchestrator import ProvisioningOrchestrator
+import importlib
+from typing import Any
+
+# Public names and the submodule that defines each. Submodules are imported
+# on first attribute access (PEP 562) so that importing the package does not
+# pull in pynetbox, requests or paramiko until they are needed.
+_LAZY_ATTRIBUTES = {
+    "NetBoxClient": "netbox_client",
+    "SSHManager": "ssh_manager",
+    "ConsoleManager": "ssh_manager",
+    "ProvisioningOrchestrator": "orchestrator",
+    "provision_many": "orchestrator",
+    "AsyncSSHManager": "ssh_manager_async",
+}
 
 __all__ = [
     "NetBoxClient",
     "SSHManager",
     "ConsoleManager",
     "ProvisioningOrchestrator",
+    "provision_many",
+    "AsyncSSHManager",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public classes from their submodules on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -5,14 +5,72 @@ This module provides a client for interacting with NetBox API to retrieve
 device configurations and metadata required for zero-touch provisioning.
 """
 
+import hashlib
+import json
 import logging
-import pynetbox
-from typing import Optional, Dict, Any
-from pynetbox.core.query import RequestError
+import os
+import tempfile
+from typing import Optional, Dict, Any, Set, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for the shared NetBox HTTP session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+# Device data attributes searched for a stored configuration, in priority
+# order, with the keys checked in each
+CONFIG_SOURCES = (
+    ('config_context', ('startup_config', 'configuration')),
+    ('custom_fields', ('startup_config', 'configuration')),
+    ('local_context_data', ('configuration',)),
+)
+
+# (url, token) pairs that have passed the connectivity probe in this process
+_VERIFIED_ENDPOINTS: Set[Tuple[str, str]] = set()
+
+# GraphQL query returning every device field used during provisioning,
+# written against the NetBox 4.3+ schema (filter lookups, 'role').
+DEVICE_BUNDLE_QUERY = """
+query ($name: String!) {
+  device_list(filters: {name: {exact: $name}}) {
+    id
+    name
+    serial
+    status
+    last_updated
+    config_context
+    custom_fields
+    local_context_data
+    device_type { model }
+    role { name }
+    site { name }
+    platform { name }
+    primary_ip4 { address }
+    primary_ip6 { address }
+    config_template { id last_updated }
+  }
+}
+"""
+
+# NetBox URLs whose GraphQL schema did not accept DEVICE_BUNDLE_QUERY; later
+# lookups against them go straight to the REST API
+_GRAPHQL_UNSUPPORTED: Set[str] = set()
+
+# Set once urllib3's InsecureRequestWarning has been silenced
+_WARNINGS_DISABLED = False
+
+
+def _disable_insecure_warnings() -> None:
+    """Silence urllib3 InsecureRequestWarning once per process."""
+    global _WARNINGS_DISABLED
+    if not _WARNINGS_DISABLED:
+        import requests
+        from requests.packages.urllib3.exceptions import InsecureRequestWarning
+        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+        _WARNINGS_DISABLED = True
+
 
 class NetBoxClientError(Exception):
     """Base exception for NetBox client errors."""
@@ -43,7 +101,14 @@ class NetBoxClient:
         nb (pynetbox.api): NetBox API client instance
     """
 
-    def __init__(self, url: str, token: str, verify_ssl: bool = True):
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        verify_ssl: bool = True,
+        probe: bool = True,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize NetBox client.
 
@@ -51,6 +116,10 @@ class NetBoxClient:
             url: NetBox server URL (e.g., 'https://netbox.example.com')
             token: NetBox API authentication token
             verify_ssl: Whether to verify SSL certificates (default: True)
+            probe: Check API connectivity on first use of this URL/token
+                pair in the process (default: True)
+            cache_dir: Directory for caching rendered configurations between
+                runs (default: None, caching disabled)
 
         Raises:
             NetBoxClientError: If connection to NetBox fails
@@ -58,34 +127,75 @@ class NetBoxClient:
         self.url = url.rstrip('/')
         self.token = token
         self.verify_ssl = verify_ssl
+        self.cache_dir = cache_dir
+        # Device records fetched during this client's lifetime, keyed by name
+        self._device_cache: Dict[str, Any] = {}
 
-        logger.info(f"Initializing NetBox client for {self.url}")
+        logger.info("Initializing NetBox client for %s", self.url)
 
         try:
+            # Imported here so that loading this module stays cheap for CLI
+            # paths (--help, --dry-run) that never talk to NetBox
+            import pynetbox
+
             self.nb = pynetbox.api(
                 url=self.url,
                 token=self.token
             )
+            self._configure_http_session()
+
             # Disable SSL verification if requested (for self-signed certs)
             if not verify_ssl:
-                import requests
-                from requests.packages.urllib3.exceptions import InsecureRequestWarning
-                requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+                _disable_insecure_warnings()
                 self.nb.http_session.verify = False
 
-            # Test connection
-            logger.debug("Testing NetBox API connection...")
-            self.nb.status()
-            logger.info("Successfully connected to NetBox API")
+            # Test connection (once per URL/token pair)
+            endpoint = (self.url, self.token)
+            if probe and endpoint not in _VERIFIED_ENDPOINTS:
+                logger.debug("Testing NetBox API connection...")
+                self.nb.http_session.head(
+                    f"{self.url}/api/",
+                    headers={'Authorization': f"Token {self.token}"},
+                    timeout=5
+                ).raise_for_status()
+                _VERIFIED_ENDPOINTS.add(endpoint)
+                logger.info("Successfully connected to NetBox API")
 
         except Exception as e:
             logger.error(f"Failed to initialize NetBox client: {e}")
             raise NetBoxClientError(f"Failed to connect to NetBox: {e}")
 
+    def _configure_http_session(self) -> None:
+        """
+        Mount a pooled, retrying adapter on the pynetbox HTTP session.
+
+        All API calls made through this client reuse the same keep-alive
+        connection, so the TCP/TLS handshake is paid once per client.
+        Idempotent requests are retried on transient gateway errors.
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504]
+            )
+        )
+        self.nb.http_session.mount('https://', adapter)
+        self.nb.http_session.mount('http://', adapter)
+
     def get_device(self, device_name: str) -> Any:
         """
         Retrieve device object from NetBox.
 
+        Device records are cached per client instance so that config, serial
+        and metadata lookups for the same device share a single API request.
+        Use invalidate() to force a fresh lookup.
+
         Args:
             device_name: Name of the device to retrieve
 
@@ -96,7 +206,14 @@ class NetBoxClient:
             DeviceNotFoundError: If device is not found
             NetBoxClientError: If API request fails
         """
-        logger.info(f"Retrieving device '{device_name}' from NetBox")
+        cached = self._device_cache.get(device_name)
+        if cached is not None:
+            logger.debug("Using cached device '%s'", device_name)
+            return cached
+
+        logger.info("Retrieving device '%s' from NetBox", device_name)
+
+        from pynetbox.core.query import RequestError
 
         try:
             device = self.nb.dcim.devices.get(name=device_name)
@@ -107,12 +224,13 @@ class NetBoxClient:
                     f"Device '{device_name}' not found in NetBox"
                 )
 
-            logger.info(f"Found device: {device.name} (ID: {device.id})")
+            logger.info("Found device: %s (ID: %s)", device.name, device.id)
             # Handle both NetBox v3 (device_role) and v4 (role) attribute names
             role = getattr(device, 'role', None) or getattr(device, 'device_role', None)
-            logger.debug(f"Device details - Role: {role}, "
-                        f"Site: {device.site}, Status: {device.status}")
+            logger.debug("Device details - Role: %s, Site: %s, Status: %s",
+                         role, device.site, device.status)
 
+            self._device_cache[device_name] = device
             return device
 
         except DeviceNotFoundError:
@@ -124,13 +242,200 @@ class NetBoxClient:
             logger.error(f"Unexpected error retrieving device: {e}")
             raise NetBoxClientError(f"Failed to retrieve device: {e}")
 
+    def get_device_bundle(self, device_name: str) -> Any:
+        """
+        Retrieve all provisioning-related device fields in one request.
+
+        Uses the NetBox GraphQL API to fetch serial, context data, custom
+        fields and related object names for the device in a single round
+        trip. The result is stored in the device cache as a pynetbox device
+        record, so it can be used anywhere get_device() results are used.
+        Falls back to get_device() if the GraphQL query is unavailable or
+        does not match the server schema.
+
+        Args:
+            device_name: Name of the device to retrieve
+
+        Returns:
+            Device object from NetBox
+
+        Raises:
+            DeviceNotFoundError: If device is not found
+            NetBoxClientError: If API request fails
+        """
+        cached = self._device_cache.get(device_name)
+        if cached is not None:
+            logger.debug("Using cached device '%s'", device_name)
+            return cached
+
+        if self.url in _GRAPHQL_UNSUPPORTED:
+            return self.get_device(device_name)
+
+        logger.info("Retrieving device bundle for '%s' via GraphQL", device_name)
+
+        try:
+            response = self.nb.http_session.post(
+                f"{self.url}/graphql/",
+                json={'query': DEVICE_BUNDLE_QUERY, 'variables': {'name': device_name}},
+                headers={
+                    'Authorization': f"Token {self.token}",
+                    'Accept': 'application/json',
+                }
+            )
+            payload = response.json() if response.status_code == 200 else {}
+            if payload.get('errors') or response.status_code in (400, 404):
+                # Older NetBox schema or GraphQL disabled: don't try again
+                logger.debug("GraphQL query not supported: %s", payload.get('errors'))
+                _GRAPHQL_UNSUPPORTED.add(self.url)
+            devices = (payload.get('data') or {}).get('device_list') or []
+        except Exception as e:
+            logger.debug("GraphQL device query failed: %s", e)
+            devices = []
+
+        if len(devices) != 1:
+            logger.debug("GraphQL lookup unavailable or inconclusive, using REST API")
+            return self.get_device(device_name)
+
+        from pynetbox.models.dcim import Devices
+
+        device = Devices(self._rest_values(devices[0]), self.nb, self.nb.dcim.devices)
+        logger.info("Found device: %s (ID: %s)", device.name, device.id)
+
+        self._device_cache[device_name] = device
+        return device
+
+    @staticmethod
+    def _rest_values(values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a GraphQL device result to the shape of a REST API record.
+
+        Args:
+            values: Device fields returned by DEVICE_BUNDLE_QUERY
+
+        Returns:
+            Device fields as the REST API returns them
+        """
+        values = dict(values)
+        # GraphQL serializes IDs as strings; REST records use integers
+        values['id'] = int(values['id'])
+
+        # GraphQL returns the status enum name (e.g. 'ACTIVE'); REST returns
+        # the value and label, and str(device.status) is the label
+        status = values.get('status')
+        if isinstance(status, str):
+            value = status.lower()
+            values['status'] = {'value': value, 'label': value.capitalize()}
+
+        # REST's primary_ip is the IPv6 address if set, else the IPv4 one
+        # (NetBox's default, PREFER_IPV4 = False)
+        values['primary_ip'] = values.pop('primary_ip6', None) or values.pop('primary_ip4', None)
+        values.pop('primary_ip4', None)
+
+        return values
+
+    def invalidate(self, device_name: Optional[str] = None) -> None:
+        """
+        Drop cached device records.
+
+        Args:
+            device_name: Device to evict (default: evict all cached devices)
+        """
+        if device_name is None:
+            self._device_cache.clear()
+        else:
+            self._device_cache.pop(device_name, None)
+
+    def _rendered_config_cache_path(self, device: Any) -> Optional[str]:
+        """
+        Build the on-disk cache path for a device's rendered configuration.
+
+        The key is built only from data already fetched with the device: its
+        last_updated timestamp and config context, and its config template's
+        ID and last_updated timestamp. No extra request is made; if any of
+        these was not loaded, the cache is not used. Changes to related
+        objects alone (interfaces, IP addresses, VLANs, ...) do not update
+        these fields, so clear the cache directory after such changes.
+
+        Args:
+            device: Device object from NetBox
+
+        Returns:
+            Cache file path, or None if caching is disabled or not possible
+        """
+        if not self.cache_dir:
+            return None
+
+        try:
+            # Read loaded fields only; attribute access on a pynetbox record
+            # fetches any field it does not have from the API
+            device_fields = vars(device)
+            template = device_fields.get('config_template')
+            if not template:
+                return None
+            template_fields = vars(template)
+
+            key_fields = [
+                device_fields.get('last_updated'),
+                template_fields.get('id'),
+                template_fields.get('last_updated'),
+            ]
+            if any(field is None for field in key_fields):
+                logger.debug("Cache key fields not loaded, not using rendered config cache")
+                return None
+
+            fingerprint = json.dumps(
+                [
+                    self.url,
+                    device_fields.get('id'),
+                    device_fields.get('config_context'),
+                    *key_fields,
+                ],
+                sort_keys=True,
+                default=str
+            )
+        except Exception as e:
+            logger.debug("Could not build rendered config cache key: %s", e)
+            return None
+
+        digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.cfg")
+
+    def _read_cached_config(self, path: str) -> Optional[str]:
+        """Return a cached rendered configuration, or None on a cache miss."""
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def _write_cached_config(self, path: str, config: str) -> None:
+        """
+        Store a rendered configuration atomically; failures are only logged.
+
+        Rendered configurations can contain secrets (enable secrets, SNMP
+        communities), so the directory is created 0700 and the file 0600.
+        """
+        try:
+            cache_dir = os.path.dirname(path)
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            # mkstemp creates the file readable and writable by the owner only
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+                cache_file.write(config)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write rendered config cache: {e}")
+
     def get_device_config(self, device_name: str) -> str:
         """
         Retrieve configuration for a device from NetBox.
 
         This method retrieves the device's configuration from NetBox using
         multiple methods in priority order:
-        1. Rendered configuration (if config template is assigned)
+        1. Rendered configuration (if config template is assigned), served
+           from the on-disk cache when cache_dir is set and the device,
+           its config context and its template are unchanged
         2. Config context data
         3. Custom fields
         4. Local context data
@@ -146,17 +451,24 @@ class NetBoxClient:
             ConfigurationNotFoundError: If configuration is not available
             NetBoxClientError: If API request fails
         """
-        logger.info(f"Retrieving configuration for device '{device_name}'")
+        logger.info("Retrieving configuration for device '%s'", device_name)
 
-        device = self.get_device(device_name)
+        device = self.get_device_bundle(device_name)
 
         # Try to get configuration from config context first
         config = None
 
+        # Reuse a previously rendered configuration if its inputs are unchanged
+        cache_path = self._rendered_config_cache_path(device)
+        if cache_path:
+            config = self._read_cached_config(cache_path)
+            if config:
+                logger.info("Using cached rendered config for %s", device_name)
+
         # Option 1: Try to get rendered configuration from NetBox config template
         if not config:
             try:
-                logger.debug(f"Attempting to fetch rendered config for device ID {device.id}")
+                logger.debug("Attempting to fetch rendered config for device ID %s", device.id)
 
                 # NetBox render-config endpoint requires POST request (not GET)
                 # Use pynetbox's render_config method: device.render_config.create()
@@ -164,12 +476,17 @@ class NetBoxClient:
                     rendered = device.render_config.create()
                     if rendered and hasattr(rendered, 'content'):
                         config = rendered.content
-                        logger.info(f"Retrieved rendered config from config template for {device_name}")
+                        logger.info(
+                            "Retrieved rendered config from config template for %s", device_name
+                        )
                     elif rendered:
                         # Some versions may return dict directly
                         config = rendered.get('content') if isinstance(rendered, dict) else str(rendered)
                         if config:
-                            logger.info(f"Retrieved rendered config from config template for {device_name}")
+                            logger.info(
+                                "Retrieved rendered config from config template for %s",
+                                device_name
+                            )
                 except AttributeError:
                     # Fallback to direct API call if render_config method doesn't exist
                     logger.debug("device.render_config.create() not available, trying direct API POST")
@@ -180,45 +497,36 @@ class NetBoxClient:
                         data = response.json()
                         if data and 'content' in data:
                             config = data['content']
-                            logger.info(f"Retrieved rendered config via API POST for {device_name}")
+                            logger.info(
+                                "Retrieved rendered config via API POST for %s", device_name
+                            )
                     elif response.status_code == 403:
                         logger.warning(
                             f"Rendered config API returned 403 Forbidden. "
                             f"API token needs write permissions to access render-config endpoint."
                         )
                     else:
-                        logger.debug(f"Rendered config API returned status {response.status_code}")
+                        logger.debug("Rendered config API returned status %s", response.status_code)
 
             except Exception as e:
-                logger.debug(f"Could not retrieve rendered config: {e}")
-
-        # Option 2: Configuration stored in config context
-        if not config and hasattr(device, 'config_context') and device.config_context:
-            if 'startup_config' in device.config_context:
-                config = device.config_context['startup_config']
-                logger.info(f"Retrieved config from config_context for {device_name}")
-            elif 'configuration' in device.config_context:
-                config = device.config_context['configuration']
-                logger.info(f"Retrieved config from config_context for {device_name}")
-
-        # Option 3: Configuration stored in custom field
-        if not config and hasattr(device, 'custom_fields'):
-            if device.custom_fields.get('startup_config'):
-                config = device.custom_fields['startup_config']
-                logger.info(f"Retrieved config from custom_fields for {device_name}")
-            elif device.custom_fields.get('configuration'):
-                config = device.custom_fields['configuration']
-                logger.info(f"Retrieved config from custom_fields for {device_name}")
-
-        # Option 4: Try to get from local context
+                logger.debug("Could not retrieve rendered config: %s", e)
+
+            if config and cache_path:
+                self._write_cached_config(cache_path, config)
+
+        # Options 2-4: Configuration stored in device data, in priority order
         if not config:
-            try:
-                local_context = device.local_context_data
-                if local_context and 'configuration' in local_context:
-                    config = local_context['configuration']
-                    logger.info(f"Retrieved config from local_context_data for {device_name}")
-            except AttributeError:
-                pass
+            for source, keys in CONFIG_SOURCES:
+                data = getattr(device, source, None)
+                if not data or not isinstance(data, dict):
+                    continue
+                for key in keys:
+                    if data.get(key):
+                        config = data[key]
+                        logger.info("Retrieved config from %s[%s] for %s", source, key, device_name)
+                        break
+                if config:
+                    break
 
         if not config:
             logger.error(f"No configuration found for device '{device_name}'")
@@ -237,9 +545,9 @@ class NetBoxClient:
                 f"Configuration for device '{device_name}' is empty"
             )
 
-        logger.info(f"Successfully retrieved configuration for {device_name} "
-                   f"({len(config)} characters)")
-        logger.debug(f"Config preview: {config[:200]}...")
+        logger.info("Successfully retrieved configuration for %s (%d characters)",
+                    device_name, len(config))
+        logger.debug("Config preview: %s...", config[:200])
 
         return config
 
@@ -260,9 +568,9 @@ class NetBoxClient:
             DeviceNotFoundError: If device is not found
             NetBoxClientError: If serial number is not available
         """
-        logger.info(f"Retrieving serial number for device '{device_name}'")
+        logger.info("Retrieving serial number for device '%s'", device_name)
 
-        device = self.get_device(device_name)
+        device = self.get_device_bundle(device_name)
 
         if not device.serial:
             logger.error(f"Serial number not found for device '{device_name}'")
@@ -272,7 +580,7 @@ class NetBoxClient:
             )
 
         serial = device.serial.strip()
-        logger.info(f"Serial number for {device_name}: {serial}")
+        logger.info("Serial number for %s: %s", device_name, serial)
 
         return serial
 
@@ -289,9 +597,9 @@ class NetBoxClient:
         Raises:
             DeviceNotFoundError: If device is not found
         """
-        logger.info(f"Retrieving metadata for device '{device_name}'")
+        logger.info("Retrieving metadata for device '%s'", device_name)
 
-        device = self.get_device(device_name)
+        device = self.get_device_bundle(device_name)
 
         # Handle both NetBox v3 (device_role) and v4 (role) attribute names
         role = getattr(device, 'role', None) or getattr(device, 'device_role', None)
@@ -300,14 +608,14 @@ class NetBoxClient:
             'name': device.name,
             'id': device.id,
             'serial': device.serial,
-            'device_type': str(device.device_type) if device.device_type else None,
+            'device_type': str(device_type) if (device_type := device.device_type) else None,
             'device_role': str(role) if role else None,
-            'site': str(device.site) if device.site else None,
-            'status': str(device.status) if device.status else None,
-            'platform': str(device.platform) if device.platform else None,
-            'primary_ip': str(device.primary_ip) if device.primary_ip else None,
+            'site': str(site) if (site := device.site) else None,
+            'status': str(status) if (status := device.status) else None,
+            'platform': str(platform) if (platform := device.platform) else None,
+            'primary_ip': str(primary_ip) if (primary_ip := device.primary_ip) else None,
         }
 
-        logger.debug(f"Device metadata: {metadata}")
+        logger.debug("Device metadata: %s", metadata)
 
         return metadata
@@ -5,12 +5,18 @@ This module coordinates the complete zero-touch provisioning workflow,
 integrating NetBox, SSH, and console management to automate device deployment.
 """
 
+import hashlib
+import hmac
 import logging
 import time
-import os
+import posixpath
 import re
-from typing import Optional, Dict, Any
-from enum import Enum
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, Set, Tuple
+from urllib.parse import quote
+from enum import IntEnum
 
 from .netbox_client import (
     NetBoxClient,
@@ -23,25 +29,151 @@ from .ssh_manager import (
     ConsoleManager,
     SSHError,
     ConnectionError,
-    CommandExecutionError
+    CommandExecutionError,
+    PROMPT_RE,
+    PASSWORD_RE,
+    COPY_COMPLETE_RE
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a background console connection attempt to finish when
+# an earlier step has failed, before leaving it to finish on its own
+CONSOLE_ABORT_WAIT = 5
+
+# Separator lines used to frame the workflow and step headings in the log
+_BANNER_EQ = "=" * 80
+_BANNER_DASH = "-" * 80
+
+# Response to 'enable': either a password prompt or the next CLI prompt
+_ENABLE_RESPONSE_RE = re.compile(f"{PASSWORD_RE.pattern}|{PROMPT_RE.pattern}")
+
+# Output fragments indicating a copy or config apply succeeded
+_SUCCESS_INDICATORS = ('bytes copied', 'ok', 'success', 'completed')
+
+# Configuration lines used as post-apply verification markers (matched per line)
+_HOSTNAME_RE = re.compile(r'hostname\s+(\S+)')
+_INTERFACE_RE = re.compile(r'interface\s+(\S+)')
+_VLAN_RE = re.compile(r'vlan\s+(\d+)')
+_IP_RE = re.compile(r'ip address\s+(\d+\.\d+\.\d+\.\d+)\s+(\d+\.\d+\.\d+\.\d+)')
+
+# Running-config lines indexed for verification, found in one scan. VLAN
+# lines may list ranges ('vlan 10,20-30'); group names are marker types.
+_RUNNING_CONFIG_MARKER_RE = re.compile(
+    r'^[ \t]*(?:interface\s+(?P<interface>\S+)'
+    r'|hostname\s+(?P<hostname>\S+)'
+    r'|vlan\s+(?P<vlan>\d[\d,-]*)'
+    r'|ip address\s+(?P<ip_address>\d+\.\d+\.\d+\.\d+)\s+\d+\.\d+\.\d+\.\d+)',
+    re.MULTILINE,
+)
+
+# Interface type name and the rest of an interface name (e.g. 'Gi' + '1/0/1')
+_INTERFACE_NAME_RE = re.compile(r'([a-z-]+)\s*(.*)')
 
-class ProvisioningState(Enum):
-    """Provisioning workflow states."""
-    INITIALIZED = "initialized"
-    NETBOX_CONNECTED = "netbox_connected"
-    CONFIG_RETRIEVED = "config_retrieved"
-    FTP_FILE_CREATED = "ftp_file_created"
-    CONSOLE_CONNECTED = "console_connected"
-    DEVICE_VERIFIED = "device_verified"
-    CONFIG_COPIED_TO_FLASH = "config_copied_to_flash"
-    CONFIG_APPLIED = "config_applied"
-    COMPLETED = "completed"
-    FAILED = "failed"
+# Full interface type names as shown in running-config (lowercase)
+_INTERFACE_TYPES = (
+    'ethernet', 'fastethernet', 'gigabitethernet', 'twogigabitethernet',
+    'fivegigabitethernet', 'tengigabitethernet', 'twentyfivegige',
+    'fortygigabitethernet', 'hundredgige', 'appgigabitethernet',
+    'port-channel', 'loopback', 'vlan', 'tunnel',
+)
+
+# Common abbreviations whose prefix matches more than one type name
+_INTERFACE_ABBREVIATIONS = {
+    'e': 'ethernet', 'eth': 'ethernet',
+    'f': 'fastethernet', 'fa': 'fastethernet',
+    'fi': 'fivegigabitethernet', 'fo': 'fortygigabitethernet',
+    't': 'tengigabitethernet', 'te': 'tengigabitethernet',
+    'tw': 'twogigabitethernet', 'twe': 'twentyfivegige',
+}
+
+
+def _vlan_ids(vlan_list: str) -> List[str]:
+    """
+    Expand a VLAN list such as '10,20-22' into individual VLAN IDs.
+
+    Args:
+        vlan_list: Comma separated VLAN IDs and ranges
+
+    Returns:
+        VLAN IDs as strings, e.g. ['10', '20', '21', '22']
+    """
+    ids: List[str] = []
+    for part in vlan_list.split(','):
+        start, _, end = part.partition('-')
+        if not start.isdigit():
+            continue
+        if end.isdigit():
+            ids.extend(str(vlan) for vlan in range(int(start), int(end) + 1))
+        else:
+            ids.append(str(int(start)))
+    return ids
+
+
+def _canonical_interface(name: str) -> str:
+    """
+    Expand an abbreviated interface name to the form running-config uses.
+
+    Args:
+        name: Interface name, e.g. 'Gi1/0/1' or 'GigabitEthernet1/0/1'
+
+    Returns:
+        Lowercase full interface name, e.g. 'gigabitethernet1/0/1'. Names
+        with an unknown type are only lowercased.
+    """
+    name = name.strip().lower()
+    match = _INTERFACE_NAME_RE.fullmatch(name)
+    if not match:
+        return name
+
+    prefix, rest = match.groups()
+    if prefix in _INTERFACE_TYPES:
+        return prefix + rest
+    if prefix in _INTERFACE_ABBREVIATIONS:
+        return _INTERFACE_ABBREVIATIONS[prefix] + rest
+
+    candidates = [full for full in _INTERFACE_TYPES if full.startswith(prefix)]
+    if len(candidates) == 1:
+        return candidates[0] + rest
+    return name
+
+
+class ProvisioningState(IntEnum):
+    """
+    Provisioning workflow states.
+
+    Values follow workflow order, so states can be compared to check how
+    far provisioning progressed. FAILED sorts before every other state.
+    """
+    FAILED = -1
+    INITIALIZED = 0
+    NETBOX_CONNECTED = 1
+    CONFIG_RETRIEVED = 2
+    FTP_FILE_CREATED = 3
+    CONSOLE_CONNECTED = 4
+    DEVICE_VERIFIED = 5
+    CONFIG_COPIED_TO_FLASH = 6
+    CONFIG_APPLIED = 7
+    COMPLETED = 8
+
+
+def _md5() -> Any:
+    """
+    Create an MD5 hash object for the flash file integrity check.
+
+    The digest is only compared with the device's 'verify /md5' output,
+    so it is marked as not used for security where Python supports it
+    (3.9+); otherwise FIPS-enabled hosts refuse to create it.
+    """
+    if sys.version_info >= (3, 9):
+        return hashlib.md5(usedforsecurity=False)
+    return hashlib.md5()
+
+
+def _serial_key(serial: str) -> bytes:
+    """Normalize a serial number for case-insensitive comparison."""
+    return serial.strip().casefold().encode('utf-8')
 
 
 class ProvisioningError(Exception):
@@ -95,7 +227,9 @@ class ProvisioningOrchestrator:
         ftp_username: str,
         ftp_password: str,
         ftp_directory: str = "/srv/ftp",
-        verify_ssl: bool = True
+        verify_ssl: bool = True,
+        netbox_client: Optional[NetBoxClient] = None,
+        netbox_cache_dir: Optional[str] = None
     ):
         """
         Initialize provisioning orchestrator.
@@ -116,6 +250,10 @@ class ProvisioningOrchestrator:
             ftp_password: FTP password
             ftp_directory: FTP directory path (default: /srv/ftp)
             verify_ssl: Verify SSL certificates (default: True)
+            netbox_client: Existing NetBox client to reuse, e.g. one shared by
+                several orchestrators (default: create one in step 1)
+            netbox_cache_dir: Directory for caching rendered configurations
+                between runs (default: None, caching disabled)
         """
         self.device_name = device_name
         self.console_port = console_port
@@ -135,17 +273,22 @@ class ProvisioningOrchestrator:
         self.ftp_password = ftp_password
         self.ftp_directory = ftp_directory
         self.verify_ssl = verify_ssl
+        self.netbox_cache_dir = netbox_cache_dir
 
         # Client instances
-        self.netbox_client: Optional[NetBoxClient] = None
+        self.netbox_client: Optional[NetBoxClient] = netbox_client
         self.ssh_manager: Optional[SSHManager] = None
         self.console_manager: Optional[ConsoleManager] = None
 
         # Provisioning data
         self.device_config: Optional[str] = None
         self.expected_serial: Optional[str] = None
+        self._expected_serial_key: Optional[bytes] = None
         self.actual_serial: Optional[str] = None
         self.config_filename: Optional[str] = None
+        self._remote_path: Optional[str] = None
+        self.config_md5: Optional[str] = None
+        self._ftp_urls: Optional[Tuple[str, str]] = None
 
         logger.info(f"Initialized provisioning orchestrator for device: {device_name}")
         logger.info(f"Console port: {console_port}")
@@ -154,8 +297,10 @@ class ProvisioningOrchestrator:
         """
         Execute complete provisioning workflow.
 
-        This method orchestrates all provisioning steps in sequence,
-        handling errors and cleanup appropriately.
+        This method orchestrates all provisioning steps, handling errors and
+        cleanup appropriately. The device console connection (step 3) is
+        established concurrently with the NetBox and FTP steps (1-2); device
+        verification only starts once all three have completed.
 
         Returns:
             True if provisioning completed successfully, False otherwise
@@ -163,19 +308,32 @@ class ProvisioningOrchestrator:
         Raises:
             ProvisioningError: If critical error occurs during provisioning
         """
-        logger.info("=" * 80)
+        logger.info(_BANNER_EQ)
         logger.info(f"STARTING ZERO-TOUCH PROVISIONING FOR: {self.device_name}")
-        logger.info("=" * 80)
+        logger.info(_BANNER_EQ)
 
         try:
-            # Step 1: Connect to NetBox and retrieve configuration
-            self._step_retrieve_netbox_config()
+            # Step 3 does not depend on steps 1-2, so the console connection
+            # is set up in the background while they run
+            executor = ThreadPoolExecutor(max_workers=1)
+            console_future = executor.submit(self._step_connect_to_console)
+            try:
+                # Step 1: Connect to NetBox and retrieve configuration
+                self._step_retrieve_netbox_config()
 
-            # Step 2: Create configuration file on FTP server
-            self._step_create_ftp_file()
+                # Step 2: Create configuration file on FTP server
+                self._step_create_ftp_file()
+            except Exception:
+                self._abandon_console_connection(console_future)
+                raise
+            finally:
+                # Never block here; the future is waited on explicitly
+                executor.shutdown(wait=False)
 
-            # Step 3: Connect to device console
-            self._step_connect_to_console()
+            # Step 3: Wait for the device console connection
+            console_future.result()
+
+            self.state = ProvisioningState.CONSOLE_CONNECTED
 
             # Step 4: Verify device identity
             self._step_verify_device()
@@ -188,21 +346,21 @@ class ProvisioningOrchestrator:
 
             # Mark as completed
             self.state = ProvisioningState.COMPLETED
-            logger.info("=" * 80)
+            logger.info(_BANNER_EQ)
             logger.info(f"PROVISIONING COMPLETED SUCCESSFULLY FOR: {self.device_name}")
-            logger.info("=" * 80)
+            logger.info(_BANNER_EQ)
 
             return True
 
         except Exception as e:
-            self.state = ProvisioningState.FAILED
-            logger.error("=" * 80)
+            logger.error(_BANNER_EQ)
             logger.error(f"PROVISIONING FAILED FOR: {self.device_name}")
             logger.error(f"Error: {e}")
-            logger.error("=" * 80)
+            logger.error(_BANNER_EQ)
 
-            # Attempt cleanup
+            # Attempt cleanup (based on the last state reached)
             self._cleanup()
+            self.state = ProvisioningState.FAILED
 
             raise ProvisioningError(f"Provisioning failed: {e}")
 
@@ -210,19 +368,61 @@ class ProvisioningOrchestrator:
             # Always close connections
             self._close_connections()
 
+    def _abandon_console_connection(self, console_future: 'Future[None]') -> None:
+        """
+        Stop waiting for the background console connection after a failure.
+
+        The attempt is cancelled if it has not started. Otherwise it is
+        given CONSOLE_ABORT_WAIT seconds to finish, so that connection
+        retries do not hold up cleanup. An attempt still running after that
+        logs its outcome and closes its connection when it ends.
+
+        Args:
+            console_future: Future of the _step_connect_to_console() call
+        """
+        if console_future.cancel():
+            logger.debug("Cancelled pending console connection")
+            return
+
+        def finish(future: 'Future[None]') -> None:
+            error = future.exception()
+            if error is not None:
+                logger.warning(f"Background console connection failed: {error}")
+            if self.console_manager:
+                try:
+                    self.console_manager.close()
+                except Exception as e:
+                    logger.warning(f"Error closing console connection: {e}")
+
+        try:
+            console_future.exception(timeout=CONSOLE_ABORT_WAIT)
+        except FutureTimeoutError:
+            logger.warning(
+                "Console connection still in progress; it will be closed when it finishes"
+            )
+            console_future.add_done_callback(finish)
+            return
+
+        error = console_future.exception()
+        if error is not None:
+            logger.warning(f"Background console connection failed: {error}")
+
     def _step_retrieve_netbox_config(self) -> None:
         """Step 1: Retrieve device configuration from NetBox."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 1: Retrieving configuration from NetBox")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
-            # Initialize NetBox client
-            self.netbox_client = NetBoxClient(
-                url=self.netbox_url,
-                token=self.netbox_token,
-                verify_ssl=self.verify_ssl
-            )
+            # Initialize NetBox client unless one was supplied; its pooled
+            # HTTP session is shared by every request below
+            if self.netbox_client is None:
+                self.netbox_client = NetBoxClient(
+                    url=self.netbox_url,
+                    token=self.netbox_token,
+                    verify_ssl=self.verify_ssl,
+                    cache_dir=self.netbox_cache_dir
+                )
             self.state = ProvisioningState.NETBOX_CONNECTED
 
             # Retrieve device configuration
@@ -232,6 +432,7 @@ class ProvisioningOrchestrator:
             # Retrieve expected serial number
             logger.info(f"Fetching serial number for device: {self.device_name}")
             self.expected_serial = self.netbox_client.get_device_serial(self.device_name)
+            self._expected_serial_key = _serial_key(self.expected_serial)
 
             self.state = ProvisioningState.CONFIG_RETRIEVED
             logger.info(f"Successfully retrieved configuration ({len(self.device_config)} bytes)")
@@ -246,16 +447,17 @@ class ProvisioningOrchestrator:
 
     def _step_create_ftp_file(self) -> None:
         """Step 2: Create configuration file on FTP server."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 2: Creating configuration file on FTP server")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
             # Generate configuration filename
             self.config_filename = f"{self.device_name}.txt"
-            remote_path = os.path.join(self.ftp_directory, self.config_filename)
+            # The jump host is a POSIX system regardless of the local OS
+            self._remote_path = posixpath.join(self.ftp_directory, self.config_filename)
 
-            logger.info(f"Target file: {remote_path}")
+            logger.info(f"Target file: {self._remote_path}")
             logger.info(f"Connecting to jump host: {self.jumphost_ip}")
 
             # Connect to jump host
@@ -268,18 +470,16 @@ class ProvisioningOrchestrator:
 
             # Create configuration file
             logger.info(f"Creating configuration file: {self.config_filename}")
-            self.ssh_manager.create_remote_file(remote_path, self.device_config)
-
-            # Verify file was created
-            stdout, stderr, exit_code = self.ssh_manager.execute_command(
-                f"ls -lh {remote_path}"
+            # SFTP stat inside create_remote_file confirms the file size; the
+            # MD5 of the uploaded bytes is kept to check the copy on the device
+            md5 = _md5()
+            size = self.ssh_manager.create_remote_file(
+                self._remote_path, self.device_config, hasher=md5
             )
+            self.config_md5 = md5.hexdigest()
 
-            if exit_code == 0:
-                logger.info(f"File created successfully: {stdout.strip()}")
-                self.state = ProvisioningState.FTP_FILE_CREATED
-            else:
-                raise CommandExecutionError(f"File verification failed: {stderr}")
+            logger.info(f"File created successfully: {self._remote_path} ({size} bytes)")
+            self.state = ProvisioningState.FTP_FILE_CREATED
 
         except SSHError as e:
             logger.error(f"SSH error creating FTP file: {e}")
@@ -287,9 +487,9 @@ class ProvisioningOrchestrator:
 
     def _step_connect_to_console(self) -> None:
         """Step 3: Connect to device console via terminal server."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 3: Connecting to device console")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
             logger.info(f"Connecting to terminal server: {self.terminal_server_ip}")
@@ -306,15 +506,13 @@ class ProvisioningOrchestrator:
 
             # Connect to device console
             logger.info(f"Accessing console port: {self.console_port}")
-            self.console_manager.connect_to_console(self.console_port)
+            self.console_manager.connect_to_console_direct(self.console_port)
 
-            self.state = ProvisioningState.CONSOLE_CONNECTED
             logger.info("Successfully connected to device console")
 
             # Send enter to get prompt
-            time.sleep(2)
             self.console_manager.channel.send('\n')
-            time.sleep(1)
+            self.console_manager._read_until(PROMPT_RE, timeout=3)
 
             # Enter enable mode
             logger.info("Entering enable mode")
@@ -335,12 +533,10 @@ class ProvisioningOrchestrator:
             ProvisioningError: If unable to enter enable mode
         """
         try:
-            # Send carriage return to get current prompt
-            self.console_manager.channel.send('\r\n')
-            time.sleep(1)
-            output = self.console_manager._read_channel()
+            # Send a single carriage return so exactly one prompt comes back
+            output = self.console_manager._send_and_read_until('\r', PROMPT_RE, timeout=5)
 
-            logger.debug(f"Current prompt: {output[-50:]}")
+            logger.debug("Current prompt: %s", output[-50:])
 
             # Check if already in enable mode (prompt ends with #)
             if '#' in output:
@@ -349,22 +545,20 @@ class ProvisioningOrchestrator:
 
             # Try to enter enable mode
             logger.info("Attempting to enter enable mode with 'enable' command")
-            self.console_manager.channel.send('enable\r\n')
-            time.sleep(2)
-            output = self.console_manager._read_channel()
+            output = self.console_manager._send_and_read_until(
+                'enable\r', _ENABLE_RESPONSE_RE, timeout=5
+            )
 
             # Check if password is required
             if 'password:' in output.lower() or 'Password:' in output:
                 logger.warning("Enable password required but not configured")
                 logger.warning("Attempting to proceed without password (press Enter)")
-                self.console_manager.channel.send('\r\n')
-                time.sleep(2)
-                output = self.console_manager._read_channel()
+                output = self.console_manager._send_and_read_until(
+                    '\r', PROMPT_RE, timeout=5
+                )
 
             # Verify we're in enable mode now
-            self.console_manager.channel.send('\r\n')
-            time.sleep(1)
-            output = self.console_manager._read_channel()
+            output = self.console_manager._send_and_read_until('\r', PROMPT_RE, timeout=5)
 
             if '#' not in output:
                 logger.error(f"Failed to enter enable mode. Prompt: {output[-100:]}")
@@ -381,23 +575,17 @@ class ProvisioningOrchestrator:
 
     def _step_verify_device(self) -> None:
         """Step 4: Verify device identity by comparing serial numbers."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 4: Verifying device identity")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
-            # Disable pagination to get full output without --More-- prompts
+            # Disable pagination to get full output without --More-- prompts,
+            # and run show version in the same exchange
             logger.info("Disabling terminal pagination")
-            self.console_manager.execute_device_command(
-                command='terminal length 0',
-                wait_time=2
-            )
-
             logger.info("Executing 'show version' command")
-
-            # Execute show version
-            output = self.console_manager.execute_device_command(
-                command='show version',
+            output = self.console_manager.execute_device_commands(
+                ['terminal length 0', 'show version'],
                 wait_time=10
             )
 
@@ -406,7 +594,7 @@ class ProvisioningOrchestrator:
 
             if not self.actual_serial:
                 logger.error("Could not extract serial number from device output")
-                logger.debug(f"Show version output: {output}")
+                logger.debug("Show version output: %s", output)
                 raise DeviceVerificationError(
                     "Failed to extract serial number from 'show version' output"
                 )
@@ -415,7 +603,16 @@ class ProvisioningOrchestrator:
             logger.info(f"Expected serial: {self.expected_serial}")
             logger.info(f"Actual serial:   {self.actual_serial}")
 
-            if self.expected_serial.lower() != self.actual_serial.lower():
+            expected_key = self._expected_serial_key
+            if expected_key is None:
+                logger.error("No expected serial number available for comparison")
+                raise DeviceVerificationError(
+                    "Expected serial number was not retrieved from NetBox; "
+                    "cannot verify device identity"
+                )
+
+            # Constant-time compare so the expected serial is not leaked via timing
+            if not hmac.compare_digest(expected_key, _serial_key(self.actual_serial)):
                 logger.error("SERIAL NUMBER MISMATCH!")
                 logger.error(f"Expected: {self.expected_serial}")
                 logger.error(f"Got:      {self.actual_serial}")
@@ -434,24 +631,47 @@ class ProvisioningOrchestrator:
             logger.error(f"Device verification error: {e}")
             raise ProvisioningError(f"Failed to verify device: {e}")
 
+    def _build_ftp_url(self) -> Tuple[str, str]:
+        """
+        Build the FTP URL the device uses to fetch its configuration.
+
+        Credentials are percent-encoded so that characters such as '@', ':'
+        or '/' in the username or password do not break the URL. The result
+        is computed once per configuration file.
+
+        IOS 'copy ftp://' does not reliably decode %xx escapes in the
+        username and password, so credentials that need encoding may still
+        fail to authenticate; a warning is logged when that is the case.
+
+        Returns:
+            Tuple of (ftp_url, ftp_url_log) where the log form hides the password
+        """
+        if self._ftp_urls is None:
+            user = quote(self.ftp_username, safe='')
+            password = quote(self.ftp_password, safe='')
+            if user != self.ftp_username or password != self.ftp_password:
+                logger.warning(
+                    "FTP username or password contains characters that must be "
+                    "percent-encoded in the URL; some IOS versions do not decode "
+                    "them and the copy may fail to authenticate"
+                )
+            location = f"@{self.ftp_server_ip}//{self.config_filename}"
+            self._ftp_urls = (
+                f"ftp://{user}:{password}{location}",
+                f"ftp://{user}:****{location}",
+            )
+
+        return self._ftp_urls
+
     def _step_copy_config_to_flash(self) -> None:
         """Step 5: Copy configuration from FTP to device flash."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 5: Copying configuration to device flash")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
-            # Construct FTP URL
-            ftp_url = (
-                f"ftp://{self.ftp_username}:{self.ftp_password}"
-                f"@{self.ftp_server_ip}//{self.config_filename}"
-            )
-
-            # Sanitized URL for logging (hide password)
-            ftp_url_log = (
-                f"ftp://{self.ftp_username}:****"
-                f"@{self.ftp_server_ip}//{self.config_filename}"
-            )
+            # Construct FTP URL and its sanitized form for logging
+            ftp_url, ftp_url_log = self._build_ftp_url()
 
             copy_command = f"copy {ftp_url} flash: vrf Mgmt-vrf"
             copy_command_log = f"copy {ftp_url_log} flash: vrf Mgmt-vrf"
@@ -463,21 +683,24 @@ class ProvisioningOrchestrator:
                 command=copy_command,
                 wait_time=30,
                 timeout=300,  # 5 minutes for large configs
+                expect=COPY_COMPLETE_RE,
                 auto_confirm=True  # Automatically confirm destination filename prompt
             )
 
             # Check for successful copy
-            if 'bytes copied' in output.lower() or 'ok' in output.lower():
+            low = output.lower()
+            if 'bytes copied' in low or 'ok' in low:
                 logger.info("Configuration successfully copied to flash")
+                self._verify_flash_copy()
                 self.state = ProvisioningState.CONFIG_COPIED_TO_FLASH
-            elif 'error' in output.lower() or 'fail' in output.lower():
+            elif 'error' in low or 'fail' in low:
                 logger.error(f"Copy failed: {output}")
                 raise ConfigurationDeploymentError(
                     f"Failed to copy configuration to flash: {output}"
                 )
             else:
                 logger.warning("Copy command completed but success unclear")
-                logger.debug(f"Copy output: {output}")
+                logger.debug("Copy output: %s", output)
 
         except ConfigurationDeploymentError:
             raise
@@ -485,11 +708,46 @@ class ProvisioningOrchestrator:
             logger.error(f"Error copying configuration to flash: {e}")
             raise ProvisioningError(f"Failed to copy config to flash: {e}")
 
+    def _verify_flash_copy(self) -> None:
+        """
+        Check the copied file on flash against the MD5 of the uploaded file.
+
+        A single 'verify /md5' command checks the whole file, catching a
+        truncated or corrupted transfer before it is applied. Devices that do
+        not support the command are skipped with a warning.
+
+        Raises:
+            ConfigurationDeploymentError: If the device reports a different hash
+        """
+        if not self.config_md5:
+            return
+
+        logger.info("Verifying MD5 of configuration file on flash")
+        output = self.console_manager.execute_device_command(
+            command=f"verify /md5 flash:{self.config_filename} {self.config_md5}",
+            wait_time=10,
+            timeout=120,
+            expect=PROMPT_RE
+        )
+
+        low = output.lower()
+        if 'verified (' in low:
+            logger.info(f"✓ Flash file MD5 verified: {self.config_md5}")
+        elif 'computed signature' in low or '%error verifying' in low:
+            logger.error(f"Flash file MD5 mismatch: {output}")
+            raise ConfigurationDeploymentError(
+                f"Configuration file on flash does not match the uploaded file "
+                f"(expected MD5 {self.config_md5})"
+            )
+        else:
+            logger.warning("Could not verify flash file MD5; continuing without it")
+            logger.debug("verify /md5 output: %s", output)
+
     def _step_apply_configuration(self) -> None:
         """Step 6: Apply configuration to running-config."""
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
         logger.info("STEP 6: Applying configuration to device")
-        logger.info("-" * 80)
+        logger.info(_BANNER_DASH)
 
         try:
             apply_command = f"copy {self.config_filename} running-config"
@@ -500,38 +758,31 @@ class ProvisioningOrchestrator:
                 command=apply_command,
                 wait_time=60,
                 timeout=600,  # 10 minutes for config application
+                expect=COPY_COMPLETE_RE,
                 auto_confirm=True  # Automatically confirm any prompts
             )
 
             # Check for errors in output
-            if 'error' in output.lower() and 'no error' not in output.lower():
+            low = output.lower()
+            if 'error' in low and 'no error' not in low:
                 logger.error(f"Configuration application error: {output}")
                 raise ConfigurationDeploymentError(
                     f"Errors occurred while applying configuration: {output}"
                 )
 
             # Check for success indicators
-            if 'bytes copied' in output.lower() or any(
-                indicator in output.lower()
-                for indicator in ['ok', 'success', 'completed']
-            ):
+            if any(indicator in low for indicator in _SUCCESS_INDICATORS):
                 logger.info("Configuration successfully applied!")
                 self.state = ProvisioningState.CONFIG_APPLIED
             else:
                 logger.warning("Configuration apply completed but status unclear")
-                logger.debug(f"Apply output: {output}")
+                logger.debug("Apply output: %s", output)
 
-            # Send extra carriage returns after config application to clear any prompts
-            logger.debug("Sending carriage returns to ensure clean prompt after config application")
-            self.console_manager.channel.send('\r\n')
-            time.sleep(1)
-            self.console_manager.channel.send('\r\n')
-            time.sleep(1)
-            self.console_manager._read_channel()  # Clear buffer
-
-            # Wait for device to process configuration
+            # Wait for device to process configuration; the carriage returns
+            # sent while polling also clear any leftover prompts
             logger.info("Waiting for device to process configuration...")
-            time.sleep(10)
+            if not self._wait_for_device_ready():
+                logger.warning("Device did not return to a privileged prompt; verifying anyway")
 
             # Verify configuration was applied by extracting key config elements
             logger.info("Verifying configuration application...")
@@ -543,6 +794,31 @@ class ProvisioningOrchestrator:
             logger.error(f"Error applying configuration: {e}")
             raise ProvisioningError(f"Failed to apply configuration: {e}")
 
+    def _wait_for_device_ready(self, max_wait: float = 10.0, interval: float = 0.5) -> bool:
+        """
+        Wait until the device answers with a privileged EXEC prompt.
+
+        Sends a carriage return every interval and returns as soon as the
+        device responds with a '#' prompt, so devices that settle quickly do
+        not pay the full max_wait.
+
+        Args:
+            max_wait: Maximum time to wait in seconds (default: 10)
+            interval: Time to wait for each prompt in seconds (default: 0.5)
+
+        Returns:
+            True if the device responded with a prompt, False on timeout
+        """
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
+            output = self.console_manager._send_and_read_until(
+                '\r', PROMPT_RE, timeout=interval
+            )
+            if output.rstrip().endswith('#'):
+                return True
+
+        return False
+
     def _verify_configuration_applied(self) -> None:
         """
         Verify that configuration was actually applied to the device.
@@ -567,40 +843,56 @@ class ProvisioningOrchestrator:
 
         logger.info(f"Extracted {len(verification_items)} verification markers")
 
-        # Check each verification item
+        # Fetch the running configuration once and check every marker locally
+        try:
+            output = self.console_manager.execute_device_command(
+                command='show running-config',
+                wait_time=5,
+                timeout=120
+            )
+        except Exception as e:
+            logger.warning(f"Could not retrieve running-config for verification: {e}")
+            # Don't fail on verification command errors, just log them
+            return
+
+        running_config = output.replace('\r', '').lower()
+
+        # Index the running-config with one regex scan so each marker is a
+        # set lookup. Interface names are stored in full form, since
+        # running-config always expands abbreviations (Gi1/0/1 ->
+        # GigabitEthernet1/0/1). IP addresses are compared as whole tokens,
+        # so 10.0.0.1 does not match 10.0.0.10.
+        config_index: Dict[str, Set[str]] = {
+            'interface': set(), 'hostname': set(), 'vlan': set(), 'ip_address': set(),
+        }
+        for match in _RUNNING_CONFIG_MARKER_RE.finditer(running_config):
+            kind = match.lastgroup
+            if kind is None:
+                continue
+            if kind == 'interface':
+                config_index[kind].add(_canonical_interface(match.group(kind)))
+            elif kind == 'vlan':
+                config_index[kind].update(_vlan_ids(match.group(kind)))
+            else:
+                config_index[kind].add(match.group(kind))
+
         failed_items = []
         for item_type, item_value in verification_items:
-            logger.debug(f"Checking {item_type}: {item_value}")
-
-            # Build verification command based on item type
-            if item_type == 'hostname':
-                verify_cmd = 'show running-config | include hostname'
-            elif item_type == 'interface':
-                verify_cmd = f'show running-config interface {item_value} | include description'
+            value = item_value.lower()
+            if item_type == 'interface':
+                found = _canonical_interface(value) in config_index[item_type]
             elif item_type == 'vlan':
-                verify_cmd = f'show running-config | include vlan {item_value}'
-            elif item_type == 'ip_address':
-                verify_cmd = f'show running-config | include {item_value}'
+                found = str(int(value)) in config_index[item_type]
+            elif item_type in config_index:
+                found = value in config_index[item_type]
             else:
-                verify_cmd = f'show running-config | include {item_value}'
-
-            try:
-                output = self.console_manager.execute_device_command(
-                    command=verify_cmd,
-                    wait_time=5,
-                    timeout=30
-                )
+                found = value in running_config
 
-                # Check if the expected value appears in output
-                if item_value.lower() not in output.lower():
-                    logger.error(f"Verification failed for {item_type}: {item_value}")
-                    failed_items.append((item_type, item_value))
-                else:
-                    logger.debug(f"✓ Verified {item_type}: {item_value}")
-
-            except Exception as e:
-                logger.warning(f"Could not verify {item_type} {item_value}: {e}")
-                # Don't fail on verification command errors, just log them
+            if found:
+                logger.debug("✓ Verified %s: %s", item_type, item_value)
+            else:
+                logger.error(f"Verification failed for {item_type}: {item_value}")
+                failed_items.append((item_type, item_value))
 
         # If any verification failed, raise error
         if failed_items:
@@ -626,37 +918,62 @@ class ProvisioningOrchestrator:
         if not self.device_config:
             return []
 
-        markers = []
-
-        # Extract hostname
-        hostname_match = re.search(r'^hostname\s+(\S+)', self.device_config, re.MULTILINE)
-        if hostname_match:
-            markers.append(('hostname', hostname_match.group(1)))
+        hostname = None
+        interfaces: List[str] = []
+        vlans: List[str] = []
+        ips: List[str] = []
+        interfaces_seen = 0
+        # Interface whose block is being scanned for a description line
+        current_interface = None
+
+        # Single pass over the configuration; most lines are rejected by a
+        # cheap prefix or substring test before any regex is applied
+        for line in self.device_config.splitlines():
+            if line.startswith('interface'):
+                current_interface = None
+                # Check the first 3 interfaces for descriptions
+                if interfaces_seen < 3:
+                    match = _INTERFACE_RE.match(line)
+                    if match:
+                        interfaces_seen += 1
+                        current_interface = match.group(1)
+                continue
+
+            if current_interface is not None and 'description' in line:
+                parts = line.split(None, 1)
+                if parts[0] == 'description' and len(parts) == 2:
+                    interfaces.append(current_interface)
+                    current_interface = None
+
+            if hostname is None and line.startswith('hostname'):
+                match = _HOSTNAME_RE.match(line)
+                if match:
+                    hostname = match.group(1)
+            elif len(vlans) < 3 and line.startswith('vlan'):  # Check first 3 VLANs
+                match = _VLAN_RE.match(line)
+                if match:
+                    vlans.append(match.group(1))
+            elif len(ips) < 2 and 'ip address' in line:  # Check first 2 IP addresses
+                match = _IP_RE.search(line)
+                if match:
+                    ips.append(match.group(1))
+
+            # Stop once every marker type is complete
+            if (
+                hostname is not None
+                and len(vlans) == 3
+                and len(ips) == 2
+                and interfaces_seen == 3
+                and current_interface is None
+            ):
+                break
 
-        # Extract first 3 interface configurations with descriptions
-        interface_matches = re.findall(
-            r'^interface\s+(\S+).*?(?:description\s+(.+?))?(?=^interface|\Z)',
-            self.device_config,
-            re.MULTILINE | re.DOTALL
-        )
-        for intf, desc in interface_matches[:3]:
-            if desc and desc.strip():
-                markers.append(('interface', intf))
-
-        # Extract VLANs
-        vlan_matches = re.findall(r'^vlan\s+(\d+)', self.device_config, re.MULTILINE)
-        for vlan in vlan_matches[:3]:  # Check first 3 VLANs
-            markers.append(('vlan', vlan))
-
-        # Extract IP addresses (IPv4)
-        ip_matches = re.findall(
-            r'ip address\s+(\d+\.\d+\.\d+\.\d+)\s+(\d+\.\d+\.\d+\.\d+)',
-            self.device_config
-        )
-        for ip, mask in ip_matches[:2]:  # Check first 2 IP addresses
-            markers.append(('ip_address', ip))
+        markers = [('hostname', hostname)] if hostname else []
+        markers.extend(('interface', intf) for intf in interfaces)
+        markers.extend(('vlan', vlan) for vlan in vlans)
+        markers.extend(('ip_address', ip) for ip in ips)
 
-        logger.debug(f"Extracted verification markers: {markers}")
+        logger.debug("Extracted verification markers: %s", markers)
         return markers
 
     def _cleanup(self) -> None:
@@ -666,14 +983,15 @@ class ProvisioningOrchestrator:
         try:
             # Remove FTP file if it was created
             if (
-                self.state.value >= ProvisioningState.FTP_FILE_CREATED.value
+                self.state >= ProvisioningState.FTP_FILE_CREATED
                 and self.ssh_manager
-                and self.config_filename
+                and self._remote_path
             ):
                 logger.info(f"Removing FTP file: {self.config_filename}")
-                remote_path = os.path.join(self.ftp_directory, self.config_filename)
                 try:
-                    self.ssh_manager.execute_command(f"rm -f {remote_path}")
+                    self.ssh_manager.execute_command(
+                        f"rm -f {self._remote_path}", capture_stderr=False
+                    )
                     logger.info("FTP file removed")
                 except Exception as e:
                     logger.warning(f"Failed to remove FTP file: {e}")
@@ -707,8 +1025,48 @@ class ProvisioningOrchestrator:
         return {
             'device_name': self.device_name,
             'console_port': self.console_port,
-            'state': self.state.value,
+            'state': self.state.name.lower(),
             'expected_serial': self.expected_serial,
             'actual_serial': self.actual_serial,
             'config_filename': self.config_filename,
         }
+
+
+def provision_many(
+    orchestrators: List[ProvisioningOrchestrator],
+    max_workers: Optional[int] = None
+) -> Dict[str, bool]:
+    """
+    Provision several devices concurrently.
+
+    Each orchestrator runs its normal sequential workflow in its own worker
+    thread. The workflow is dominated by network and console waits, so the
+    total time approaches that of the slowest device rather than the sum.
+
+    Args:
+        orchestrators: Orchestrators to run, one per device
+        max_workers: Maximum concurrent provisioning runs
+            (default: one per orchestrator)
+
+    Returns:
+        Dictionary mapping device name to provisioning success
+    """
+    if not orchestrators:
+        return {}
+
+    logger.info(f"Provisioning {len(orchestrators)} devices concurrently")
+
+    results: Dict[str, bool] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(orchestrators)) as executor:
+        futures = {
+            executor.submit(orchestrator.provision_device): orchestrator
+            for orchestrator in orchestrators
+        }
+        for future, orchestrator in futures.items():
+            try:
+                results[orchestrator.device_name] = future.result()
+            except ProvisioningError as e:
+                logger.error(f"Provisioning failed for {orchestrator.device_name}: {e}")
+                results[orchestrator.device_name] = False
+
+    return results
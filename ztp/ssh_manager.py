@@ -5,10 +5,19 @@ This module provides SSH connection managers for interacting with jump hosts,
 terminal servers, and network devices through console connections.
 """
 
+import atexit
+import codecs
+import hashlib
 import logging
+import random
+import threading
 import time
 import re
-from typing import Optional, Tuple
+import select
+import shlex
+import socket
+import uuid
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple, Union
 import paramiko
 from paramiko.ssh_exception import (
     SSHException,
@@ -19,6 +28,199 @@ from paramiko.ssh_exception import (
 
 logger = logging.getLogger(__name__)
 
+# Console response patterns used to stop reading as soon as the device answers
+PROMPT_RE = re.compile(r'[>#]\s*$')
+PASSWORD_RE = re.compile(r'[Pp]assword:')
+COPY_COMPLETE_RE = re.compile(r'bytes copied|\[OK', re.IGNORECASE)
+
+# Confirmation prompts answered with Enter when auto_confirm is set
+_CONFIRM_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Destination filename \[.*?\]\?',
+        r'\[confirm\]',
+        r'\(y/n\)',
+        r'\[yes/no\]',
+    )
+]
+
+# Pagination prompt ('--More--' or '-- More --') in one scan
+_PAGINATION_RE = re.compile(r'-(?:-More--|- More --)')
+
+# Console output cleanup: pagination markers, backspaces and ANSI escape
+# codes, removed in a single pass. Starting with a character class (the
+# lookbehinds only select the branch) lets the regex engine skip straight
+# to candidate positions, which a plain alternation does not.
+_CLEAN_RE = re.compile(
+    r'[-\x08\x1b](?:(?<=-)(?:-More--|- More --)|(?<=\x08)\x08*|(?<=\x1b)\[[0-9;]*[a-zA-Z])'
+)
+
+# Common patterns for serial number in show version output, in priority
+# order (earlier patterns win)
+_SERIAL_PATTERN_SOURCES = (
+    # Cisco IOS XE / Catalyst switches
+    r'Model [Nn]umber\s*:?\s*\S+\s+[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
+    r'[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
+    # Standard patterns
+    r'[Ss]erial\s+[Nn]umber\s*:?\s+(\S+)',
+    r'[Pp]rocessor [Bb]oard ID\s+(\S+)',
+    r'Chassis Serial Number\s*:?\s+(\S+)',
+    # Alternative patterns
+    r'Serial [Nn]um\s*:?\s*(\S+)',
+    r'SN\s*:?\s*(\S+)',
+)
+
+_SERIAL_PATTERNS = [re.compile(source, re.IGNORECASE) for source in _SERIAL_PATTERN_SOURCES]
+
+# All serial patterns fused into one alternation, so the output is scanned
+# once. Each capture group is named v<index> to identify its pattern. The
+# alternation is a lookahead, so matches may overlap (e.g. 'Serial Number'
+# inside 'Chassis Serial Number') and no pattern hides another.
+_SERIAL_UNION = re.compile(
+    '(?=' + '|'.join(
+        '(?:{})'.format(source.replace(r'(\S+)', f'(?P<v{index}>\\S+)'))
+        for index, source in enumerate(_SERIAL_PATTERN_SOURCES)
+    ) + ')',
+    re.IGNORECASE
+)
+
+# Every serial pattern starts with one of these words, so the fused pattern
+# only needs to be tried where one occurs
+_SERIAL_TOKENS = ('model', 'system', 'serial', 'processor', 'chassis', 'sn')
+
+# Token search for non-ASCII output, where IGNORECASE matching folds
+# characters that str.lower() does not. The lookahead finds overlapping
+# occurrences too.
+_SERIAL_TOKEN_RE = re.compile(
+    '(?={})'.format('|'.join(_SERIAL_TOKENS)), re.IGNORECASE
+)
+
+# Values some platforms print in place of a real serial number
+_SERIAL_PLACEHOLDERS = frozenset(('none', 'n/a', 'unknown', ''))
+
+# Poll interval (seconds) while waiting for a console response when the
+# channel cannot be waited on with select()
+READ_POLL_INTERVAL = 0.02
+
+# Longest wait (seconds) for new console data before re-checking timers
+READ_WAIT_INTERVAL = 1.0
+
+# Characters of unhandled output kept between reads, so that prompts split
+# across two reads are still detected. Grown per command to fit longer
+# expect strings.
+SCAN_TAIL_SIZE = 512
+
+# Terminal server shell prompt, pmshell port menu and console attach markers
+_SHELL_PROMPT_RE = re.compile(r'[$#>]\s*$')
+_PMSHELL_MENU_RE = re.compile(r'[:>?#$]\s*$')
+_CONSOLE_ATTACHED_RE = re.compile(r'(?i)(?<!not )\bconnected\b|escape|[>#]\s*$')
+_CONSOLE_FAILED_RE = re.compile(
+    r'(?i)\b(?:not connected|disconnected|refused|in use|no such)\b'
+)
+# Keyword on the last line of the pmshell port menu (e.g. 'Connect to port >')
+_PMSHELL_SELECT_RE = re.compile(r'(?i)\b(?:select|port)\b')
+
+# SFTP write buffer size for uploaded files
+SFTP_WRITE_BUFSIZE = 32768
+
+# Characters of file content encoded and written per SFTP write
+UPLOAD_CHUNK_SIZE = 65536
+
+# Maximum bytes requested from the console channel per recv() call
+RX_CHUNK_SIZE = 65536
+
+
+# Seconds an unused pooled SSH client is kept open before it is closed
+POOL_IDLE_TTL = 600
+
+# Round-trip time (milliseconds) above which a host is considered slow
+# enough for compression to pay off
+COMPRESSION_RTT_THRESHOLD_MS = 200
+
+# (hostname, port) of hosts found to be slow; later connections to them
+# enable transport compression
+_COMPRESS_HOSTS: Set[Tuple[str, int]] = set()
+
+
+class _PooledClient:
+    """Authenticated SSH client shared by SSHManager instances."""
+    __slots__ = ('client', 'refs', 'idle_since')
+
+    def __init__(self, client: paramiko.SSHClient):
+        self.client = client
+        self.refs = 1
+        self.idle_since = 0.0
+
+
+# Connected clients keyed by connection parameters, shared between
+# SSHManager instances so repeated connections skip the SSH handshake
+_CLIENT_POOL: Dict[tuple, _PooledClient] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _client_is_active(client: paramiko.SSHClient) -> bool:
+    """Return True if the client's transport is still usable."""
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+def _reap_idle_clients() -> None:
+    """Close pooled clients unused for POOL_IDLE_TTL seconds (pool lock held)."""
+    now = time.monotonic()
+    for key, entry in list(_CLIENT_POOL.items()):
+        if entry.refs == 0 and now - entry.idle_since > POOL_IDLE_TTL:
+            logger.debug(f"Closing idle pooled connection to {key[0]}")
+            entry.client.close()
+            del _CLIENT_POOL[key]
+
+
+@atexit.register
+def _close_pooled_clients() -> None:
+    """Close every pooled client at interpreter exit."""
+    with _POOL_LOCK:
+        for entry in _CLIENT_POOL.values():
+            entry.client.close()
+        _CLIENT_POOL.clear()
+
+
+# Upper bound (seconds) for the delay between connection attempts
+RETRY_DELAY_CAP = 60
+
+
+def _backoff_sleep(attempt: int, base: float, cap: float = RETRY_DELAY_CAP) -> None:
+    """
+    Sleep before a connection retry using exponential backoff with full jitter.
+
+    Randomizing the delay keeps many provisioners that failed together from
+    retrying against the same server in lockstep.
+
+    Args:
+        attempt: Number of the attempt that just failed (1-based)
+        base: Base delay in seconds
+        cap: Maximum delay in seconds (default: RETRY_DELAY_CAP)
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    logger.info(f"Retrying in {delay:.1f} seconds...")
+    time.sleep(delay)
+
+
+def _set_tcp_nodelay(client: paramiko.SSHClient) -> None:
+    """
+    Disable Nagle's algorithm on the client's transport socket.
+
+    Console interaction is a series of small request/response exchanges,
+    which Nagle buffering combined with delayed ACKs slows down.
+
+    Args:
+        client: Connected SSH client
+    """
+    try:
+        transport = client.get_transport()
+        if transport is not None:
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError) as e:
+        logger.debug(f"Could not set TCP_NODELAY: {e}")
+
 
 class SSHError(Exception):
     """Base exception for SSH-related errors."""
@@ -58,7 +260,8 @@ class SSHManager:
         password: Optional[str] = None,
         key_filename: Optional[str] = None,
         port: int = 22,
-        timeout: int = 30
+        timeout: int = 30,
+        compress: bool = False
     ):
         """
         Initialize SSH manager.
@@ -70,6 +273,8 @@ class SSHManager:
             key_filename: Path to SSH private key (optional)
             port: SSH port (default: 22)
             timeout: Connection timeout in seconds (default: 30)
+            compress: Enable transport compression (default: False). Only
+                worth it on slow links; see enable_compression_if_slow()
         """
         self.hostname = hostname
         self.username = username
@@ -77,24 +282,150 @@ class SSHManager:
         self.key_filename = key_filename
         self.port = port
         self.timeout = timeout
+        self.compress = compress
         self.client: Optional[paramiko.SSHClient] = None
         self._connected = False
+        self._pool_key: Optional[tuple] = None
+        self._sftp: Optional[paramiko.SFTPClient] = None
+        self._pkey: Optional[paramiko.PKey] = None
+
+    @property
+    def sftp(self) -> paramiko.SFTPClient:
+        """
+        SFTP session on this connection, opened on first use and reused.
+
+        Raises:
+            CommandExecutionError: If not connected
+        """
+        if not self._connected or not self.client:
+            raise CommandExecutionError("Not connected. Call connect() first.")
+
+        if self._sftp is None or self._sftp.sock.closed:
+            self._sftp = self.client.open_sftp()
+
+        return self._sftp
+
+    def _close_sftp(self) -> None:
+        """Close the cached SFTP session, if any."""
+        if self._sftp is not None:
+            try:
+                self._sftp.close()
+            except Exception as e:
+                logger.debug(f"Error closing SFTP session: {e}")
+            self._sftp = None
+
+    def _load_pkey(self) -> paramiko.PKey:
+        """
+        Load the private key from key_filename, once per instance.
+
+        Connection retries reuse the parsed key instead of reading and
+        parsing the key file again. The password, if set, is used to
+        decrypt an encrypted key, as paramiko does for key_filename.
+
+        Returns:
+            Parsed private key
+
+        Raises:
+            AuthenticationException: If the key is encrypted and cannot be decrypted
+            SSHException: If the key is not a supported RSA, ECDSA, Ed25519 or DSS key
+        """
+        if self._pkey is None:
+            last_error = None
+            key_classes: List[Any] = [paramiko.RSAKey, paramiko.ECDSAKey, paramiko.Ed25519Key]
+            # DSSKey was dropped in paramiko 4.0
+            if hasattr(paramiko, 'DSSKey'):
+                key_classes.append(paramiko.DSSKey)
+            for key_class in key_classes:
+                try:
+                    self._pkey = key_class.from_private_key_file(
+                        self.key_filename, password=self.password
+                    )
+                    break
+                except AuthenticationException:
+                    raise
+                except SSHException as e:
+                    last_error = e
+            else:
+                raise SSHException(f"Unsupported private key {self.key_filename}: {last_error}")
+
+        return self._pkey
+
+    def _use_compression(self) -> bool:
+        """Return True if connections to this host should be compressed."""
+        return self.compress or (self.hostname, self.port) in _COMPRESS_HOSTS
+
+    def _make_pool_key(self) -> tuple:
+        """Build the connection pool key; the password is only stored hashed."""
+        secret = hashlib.sha256((self.password or '').encode('utf-8')).digest()
+        return (
+            self.hostname, self.port, self.username, self.key_filename, secret,
+            self._use_compression()
+        )
+
+    def _acquire_pooled_client(self) -> bool:
+        """
+        Reuse an active pooled client for this host and credentials.
+
+        Returns:
+            True if a pooled client was acquired
+        """
+        key = self._make_pool_key()
+        with _POOL_LOCK:
+            _reap_idle_clients()
+            entry = _CLIENT_POOL.get(key)
+            if entry is None:
+                return False
+            if not _client_is_active(entry.client):
+                entry.client.close()
+                del _CLIENT_POOL[key]
+                return False
+            entry.refs += 1
+
+        self.client = entry.client
+        self._pool_key = key
+        self._connected = True
+        logger.info(f"Reusing existing connection to {self.hostname}")
+        return True
+
+    def _register_pooled_client(self) -> None:
+        """Add the newly connected client to the pool if none is pooled yet."""
+        key = self._make_pool_key()
+        with _POOL_LOCK:
+            entry = _CLIENT_POOL.get(key)
+            if entry is not None:
+                if _client_is_active(entry.client):
+                    # Another instance connected concurrently; keep this one private
+                    return
+                # Replacing a dead client: close it so its transport is released
+                entry.client.close()
+            _CLIENT_POOL[key] = _PooledClient(self.client)
+        self._pool_key = key
 
     def connect(self, retries: int = 3, retry_delay: int = 5) -> None:
         """
         Establish SSH connection with retry logic.
 
+        An active connection to the same host with the same credentials,
+        opened by another SSHManager, is reused instead of connecting again.
+
         Args:
             retries: Number of connection attempts (default: 3)
-            retry_delay: Delay between retries in seconds (default: 5)
+            retry_delay: Base delay between retries in seconds, doubled on each
+                attempt and randomized (default: 5)
 
         Raises:
             ConnectionError: If connection fails after all retries
         """
+        if self._acquire_pooled_client():
+            return
+
         logger.info(f"Connecting to {self.hostname}:{self.port} as {self.username}")
 
         for attempt in range(1, retries + 1):
             try:
+                # No known_hosts file is loaded and key discovery is off, so
+                # connecting does no local file I/O beyond loading an explicit
+                # key once. Reconnects reuse the pooled transport (see above).
                 self.client = paramiko.SSHClient()
                 self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
@@ -105,15 +436,18 @@ class SSHManager:
                     'timeout': self.timeout,
                     'look_for_keys': False,
                     'allow_agent': False,
+                    'compress': self._use_compression(),
                 }
 
                 if self.password:
                     connect_kwargs['password'] = self.password
                 if self.key_filename:
-                    connect_kwargs['key_filename'] = self.key_filename
+                    connect_kwargs['pkey'] = self._load_pkey()
 
                 self.client.connect(**connect_kwargs)
+                _set_tcp_nodelay(self.client)
                 self._connected = True
+                self._register_pooled_client()
 
                 logger.info(f"Successfully connected to {self.hostname}")
                 return
@@ -125,8 +459,7 @@ class SSHManager:
             except NoValidConnectionsError as e:
                 logger.warning(f"Connection attempt {attempt}/{retries} failed: {e}")
                 if attempt < retries:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
+                    _backoff_sleep(attempt, retry_delay)
                 else:
                     raise ConnectionError(f"Failed to connect after {retries} attempts: {e}")
 
@@ -142,7 +475,8 @@ class SSHManager:
         self,
         command: str,
         timeout: int = 60,
-        get_pty: bool = False
+        get_pty: bool = False,
+        capture_stderr: bool = True
     ) -> Tuple[str, str, int]:
         """
         Execute command on remote host.
@@ -151,6 +485,8 @@ class SSHManager:
             command: Command to execute
             timeout: Command timeout in seconds (default: 60)
             get_pty: Request pseudo-terminal (default: False)
+            capture_stderr: Decode and return stderr (default: True). When
+                False, stderr is drained but discarded and returned as ''
 
         Returns:
             Tuple of (stdout, stderr, exit_code)
@@ -161,7 +497,7 @@ class SSHManager:
         if not self._connected or not self.client:
             raise CommandExecutionError("Not connected. Call connect() first.")
 
-        logger.debug(f"Executing command on {self.hostname}: {command}")
+        logger.debug("Executing command on %s: %s", self.hostname, command)
 
         try:
             stdin, stdout, stderr = self.client.exec_command(
@@ -170,16 +506,19 @@ class SSHManager:
                 get_pty=get_pty
             )
 
-            # Read output
+            # Read output. Unwanted stderr is still drained so that it
+            # cannot fill the channel window and stall the command.
             stdout_output = stdout.read().decode('utf-8', errors='ignore')
-            stderr_output = stderr.read().decode('utf-8', errors='ignore')
+            stderr_data = stderr.read()
+            stderr_output = stderr_data.decode('utf-8', errors='ignore') if capture_stderr else ''
             exit_code = stdout.channel.recv_exit_status()
 
-            logger.debug(f"Command exit code: {exit_code}")
-            if stdout_output:
-                logger.debug(f"STDOUT: {stdout_output[:500]}")
-            if stderr_output:
-                logger.debug(f"STDERR: {stderr_output[:500]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Command exit code: %s", exit_code)
+                if stdout_output:
+                    logger.debug("STDOUT: %s", stdout_output[:500])
+                if stderr_output:
+                    logger.debug("STDERR: %s", stderr_output[:500])
 
             return stdout_output, stderr_output, exit_code
 
@@ -187,13 +526,183 @@ class SSHManager:
             logger.error(f"Command execution failed: {e}")
             raise CommandExecutionError(f"Failed to execute command: {e}")
 
-    def create_remote_file(self, remote_path: str, content: str) -> None:
+    def execute_command_async(self, command: str) -> paramiko.Channel:
+        """
+        Start a command on the remote host without waiting for it to finish.
+
+        Useful for background operations whose result is not needed right
+        away; several commands started this way run concurrently on the
+        one connection. Call recv_exit_status() on the returned channel to
+        wait for the exit code, and close it when done.
+
+        Args:
+            command: Command to execute
+
+        Returns:
+            Channel the command is running on
+
+        Raises:
+            CommandExecutionError: If the command cannot be started
+        """
+        if not self._connected or not self.client:
+            raise CommandExecutionError("Not connected. Call connect() first.")
+
+        logger.debug("Starting command on %s: %s", self.hostname, command)
+
+        try:
+            channel = self.client.get_transport().open_session()
+            channel.exec_command(command)
+            return channel
+
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            raise CommandExecutionError(f"Failed to execute command: {e}")
+
+    def enable_compression_if_slow(
+        self,
+        threshold_ms: float = COMPRESSION_RTT_THRESHOLD_MS
+    ) -> bool:
+        """
+        Enable compression for later connections to this host if it is slow.
+
+        Times an 'echo' round trip on the current connection. Compression
+        costs CPU and only helps when latency or bandwidth is the bottleneck,
+        so it is left off for fast hosts. The current connection is not
+        changed; connections opened afterwards (by any SSHManager or
+        ConsoleManager) use compression.
+
+        Args:
+            threshold_ms: Round-trip time in milliseconds above which
+                compression is enabled (default: 200)
+
+        Returns:
+            True if compression is enabled for this host
+
+        Raises:
+            CommandExecutionError: If not connected or the command fails
+        """
+        start = time.monotonic()
+        self.execute_command('echo', capture_stderr=False)
+        rtt_ms = (time.monotonic() - start) * 1000
+
+        if rtt_ms > threshold_ms:
+            if (self.hostname, self.port) not in _COMPRESS_HOSTS:
+                logger.info(
+                    f"Round trip to {self.hostname} took {rtt_ms:.0f} ms, "
+                    f"enabling compression for new connections"
+                )
+            _COMPRESS_HOSTS.add((self.hostname, self.port))
+        else:
+            logger.debug("Round trip to %s took %.0f ms", self.hostname, rtt_ms)
+
+        return self._use_compression()
+
+    def execute_batch(
+        self,
+        commands: List[str],
+        stop_on_error: bool = True,
+        timeout: int = 60
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Execute several commands on the remote host in a single exec call.
+
+        The commands run in one shell script that writes a marker with the
+        exit status after each command to both stdout and stderr, so the
+        combined output can be split back into per-command results. This
+        costs one channel round trip instead of one per command.
+
+        Args:
+            commands: Commands to execute, in order
+            stop_on_error: Stop at the first command that fails (default: True)
+            timeout: Timeout for the whole batch in seconds (default: 60)
+
+        Returns:
+            List of (stdout, stderr, exit_code) tuples, one per command that
+            ran; with stop_on_error, the last entry is the failed command
+
+        Raises:
+            CommandExecutionError: If command execution fails
+        """
+        if not commands:
+            return []
+
+        mark = f"__ZTP_MARK_{uuid.uuid4().hex[:8]}_"
+        lines = []
+        for index, command in enumerate(commands):
+            lines.append(command)
+            lines.append(
+                f"__ztp_rc=$?; printf '\\n{mark}{index}:%d\\n' $__ztp_rc; "
+                f"printf '\\n{mark}{index}:%d\\n' $__ztp_rc >&2"
+            )
+            if stop_on_error:
+                lines.append('[ $__ztp_rc -eq 0 ] || exit $__ztp_rc')
+
+        script = '\n'.join(lines)
+        stdout, stderr, batch_exit_code = self.execute_command(
+            f"sh -c {shlex.quote(script)}", timeout=timeout
+        )
+
+        marker_re = re.compile(rf'\n{mark}(\d+):(\d+)\n')
+        stdout_parts, stdout_tail = self._split_batch_output(stdout, marker_re)
+        stderr_parts, stderr_tail = self._split_batch_output(stderr, marker_re)
+
+        results: List[Tuple[str, str, int]] = []
+        for index in range(len(commands)):
+            if index not in stdout_parts:
+                # A command that ends the shell itself (e.g. 'exit 3') never
+                # writes its marker; its output is what follows the last one.
+                # With stop_on_error, a batch that stopped after a failed
+                # command's marker has nothing more to report.
+                stopped = stop_on_error and bool(results) and results[-1][2] != 0
+                if batch_exit_code != 0 and not stopped:
+                    results.append((stdout_tail, stderr_tail, batch_exit_code))
+                break
+            out, exit_code = stdout_parts[index]
+            err, _ = stderr_parts.get(index, ('', exit_code))
+            results.append((out, err, exit_code))
+
+        return results
+
+    @staticmethod
+    def _split_batch_output(
+        output: str,
+        marker_re: Pattern[str]
+    ) -> Tuple[Dict[int, Tuple[str, int]], str]:
+        """
+        Split batch output at command markers.
+
+        Returns:
+            Tuple of ({index: (text, exit_code)}, text after the last marker)
+        """
+        parts = {}
+        position = 0
+        for match in marker_re.finditer(output):
+            parts[int(match.group(1))] = (output[position:match.start()], int(match.group(2)))
+            position = match.end()
+
+        return parts, output[position:]
+
+    def create_remote_file(
+        self,
+        remote_path: str,
+        content: str,
+        hasher: Optional[Any] = None
+    ) -> int:
         """
         Create a file on the remote host with specified content.
 
+        The content is encoded and written in 64 KB chunks through a large,
+        pipelined SFTP buffer, so no full encoded copy of a large file is
+        held in memory. The file size reported by SFTP stat serves as the write
+        confirmation.
+
         Args:
             remote_path: Path where file should be created
             content: File content
+            hasher: hashlib object updated with the bytes written (optional)
+
+        Returns:
+            Size of the remote file in bytes
 
         Raises:
             CommandExecutionError: If file creation fails
@@ -201,26 +710,88 @@ class SSHManager:
         logger.info(f"Creating file on {self.hostname}: {remote_path}")
 
         try:
-            sftp = self.client.open_sftp()
-
-            # Write content to remote file
-            with sftp.file(remote_path, 'w') as remote_file:
-                remote_file.write(content)
-
-            sftp.close()
+            written = 0
+            sftp = self.sftp
+
+            # Write content to remote file. Pipelined writes do not wait
+            # for each WRITE to be acknowledged before sending the next;
+            # errors are still reported when the file is closed.
+            with sftp.file(remote_path, 'wb', bufsize=SFTP_WRITE_BUFSIZE) as remote_file:
+                remote_file.set_pipelined(True)
+                for start in range(0, len(content), UPLOAD_CHUNK_SIZE):
+                    chunk = content[start:start + UPLOAD_CHUNK_SIZE].encode('utf-8')
+                    remote_file.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    written += len(chunk)
+
+            size = sftp.stat(remote_path).st_size
+
+            if size != written:
+                raise CommandExecutionError(
+                    f"Remote file size {size} does not match content size {written}"
+                )
 
-            logger.info(f"Successfully created {remote_path} ({len(content)} bytes)")
+            logger.info(f"Successfully created {remote_path} ({size} bytes)")
+            return size
 
         except Exception as e:
             logger.error(f"Failed to create remote file: {e}")
             raise CommandExecutionError(f"File creation failed: {e}")
 
     def close(self) -> None:
-        """Close SSH connection."""
-        if self.client:
+        """
+        Close SSH connection.
+
+        Pooled connections are released rather than closed, so that later
+        SSHManager instances can reuse them; they are closed after
+        POOL_IDLE_TTL seconds unused, or at exit. Use force_close() to close
+        the connection immediately.
+        """
+        if not self.client:
+            return
+
+        # The SFTP session is per-instance even when the client is shared
+        self._close_sftp()
+
+        pooled = False
+        if self._pool_key is not None:
+            with _POOL_LOCK:
+                entry = _CLIENT_POOL.get(self._pool_key)
+                if entry is not None and entry.client is self.client:
+                    entry.refs = max(entry.refs - 1, 0)
+                    entry.idle_since = time.monotonic()
+                    pooled = True
+
+        if pooled:
+            logger.info(f"Releasing connection to {self.hostname}")
+        else:
+            # Not pooled, or the pool has dropped or replaced this client
             logger.info(f"Closing connection to {self.hostname}")
             self.client.close()
-            self._connected = False
+
+        self.client = None
+        self._pool_key = None
+        self._connected = False
+
+    def force_close(self) -> None:
+        """Close SSH connection immediately, even if other instances share it."""
+        if not self.client:
+            return
+
+        self._close_sftp()
+
+        if self._pool_key is not None:
+            with _POOL_LOCK:
+                entry = _CLIENT_POOL.get(self._pool_key)
+                if entry is not None and entry.client is self.client:
+                    del _CLIENT_POOL[self._pool_key]
+
+        logger.info(f"Closing connection to {self.hostname}")
+        self.client.close()
+        self.client = None
+        self._pool_key = None
+        self._connected = False
 
     def __enter__(self):
         """Context manager entry."""
@@ -248,6 +819,10 @@ class ConsoleManager:
         timeout (int): Connection timeout
         client (paramiko.SSHClient): SSH client instance
         channel: Interactive SSH channel for console session
+
+    One terminal server connection can drive several consoles at once:
+    open_console() returns a ConsoleManager per console port, each with
+    its own channel on the shared connection.
     """
 
     def __init__(
@@ -256,7 +831,8 @@ class ConsoleManager:
         username: str,
         password: str,
         port: int = 22,
-        timeout: int = 30
+        timeout: int = 30,
+        compress: bool = False
     ):
         """
         Initialize console manager.
@@ -267,15 +843,26 @@ class ConsoleManager:
             password: SSH password
             port: SSH port (default: 22)
             timeout: Connection timeout in seconds (default: 30)
+            compress: Enable transport compression (default: False). Also
+                enabled for hosts marked slow by
+                SSHManager.enable_compression_if_slow()
         """
         self.hostname = hostname
         self.username = username
         self.password = password
         self.port = port
         self.timeout = timeout
+        self.compress = compress
         self.client: Optional[paramiko.SSHClient] = None
         self.channel = None
         self._connected = False
+        self._owns_client = True
+        self._reset_rx_buffer()
+
+    def _reset_rx_buffer(self) -> None:
+        """Discard buffered console data and decoder state."""
+        self._rxbuf = bytearray()
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
 
     def connect(self, retries: int = 3, retry_delay: int = 5) -> None:
         """
@@ -283,7 +870,8 @@ class ConsoleManager:
 
         Args:
             retries: Number of connection attempts (default: 3)
-            retry_delay: Delay between retries in seconds (default: 5)
+            retry_delay: Base delay between retries in seconds, doubled on each
+                attempt and randomized (default: 5)
 
         Raises:
             ConnectionError: If connection fails
@@ -303,7 +891,9 @@ class ConsoleManager:
                     timeout=self.timeout,
                     look_for_keys=False,
                     allow_agent=False,
+                    compress=self.compress or (self.hostname, self.port) in _COMPRESS_HOSTS,
                 )
+                _set_tcp_nodelay(self.client)
 
                 self._connected = True
                 logger.info(f"Connected to terminal server {self.hostname}")
@@ -312,7 +902,7 @@ class ConsoleManager:
             except Exception as e:
                 logger.warning(f"Connection attempt {attempt}/{retries} failed: {e}")
                 if attempt < retries:
-                    time.sleep(retry_delay)
+                    _backoff_sleep(attempt, retry_delay)
                 else:
                     raise ConnectionError(
                         f"Failed to connect to terminal server after {retries} attempts: {e}"
@@ -337,16 +927,15 @@ class ConsoleManager:
             # Start interactive shell
             self.channel = self.client.invoke_shell()
             self.channel.settimeout(self.timeout)
+            self._reset_rx_buffer()
 
             # Wait for initial prompt
-            time.sleep(2)
-            self._read_channel()
+            self._read_until(_SHELL_PROMPT_RE, timeout=2)
 
             # Execute pmshell
             logger.debug("Executing pmshell command")
             self.channel.send('pmshell\n')
-            time.sleep(2)
-            output = self._read_channel()
+            output = self._read_until(_PMSHELL_MENU_RE, timeout=2)
 
             # Check if we got the console number prompt
             if 'Select' not in output and 'console' not in output.lower():
@@ -355,8 +944,11 @@ class ConsoleManager:
             # Send console port number
             logger.debug(f"Selecting console port {console_port}")
             self.channel.send(f'{console_port}\n')
-            time.sleep(3)
-            output = self._read_channel()
+            output = self._read_until(_CONSOLE_ATTACHED_RE, timeout=3)
+            if _CONSOLE_FAILED_RE.search(output):
+                raise CommandExecutionError(
+                    f"pmshell refused port {console_port}: {output.strip()[-200:]}"
+                )
 
             logger.info(f"Successfully connected to console port {console_port}")
             logger.debug(f"Console connection output: {output[:200]}")
@@ -365,14 +957,136 @@ class ConsoleManager:
             logger.error(f"Failed to connect to console: {e}")
             raise CommandExecutionError(f"Console connection failed: {e}")
 
+    def connect_to_console_direct(self, console_port: int) -> None:
+        """
+        Connect to device console by running 'pmshell <port>' directly.
+
+        Opens the console in a single exec request instead of driving the
+        pmshell menu from an interactive shell. Falls back to
+        connect_to_console() if the terminal server rejects the command
+        (the channel closes or the command exits right away) or pmshell
+        ignores the port argument and shows its port menu.
+
+        Args:
+            console_port: Console port number for the device
+
+        Raises:
+            CommandExecutionError: If console connection fails
+        """
+        if not self._connected or not self.client:
+            raise CommandExecutionError("Not connected to terminal server")
+
+        logger.info(f"Connecting to console port {console_port} via pmshell {console_port}")
+
+        try:
+            channel = self.client.get_transport().open_session()
+            channel.get_pty()
+            channel.exec_command(f'pmshell {console_port}')
+            channel.settimeout(self.timeout)
+            self.channel = channel
+            self._reset_rx_buffer()
+
+            output = ''
+            deadline = time.monotonic() + 3
+            while not channel.exit_status_ready():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wait_readable(remaining)
+                output += self._read_channel()
+                if _CONSOLE_ATTACHED_RE.search(output) or _CONSOLE_FAILED_RE.search(output):
+                    break
+
+            # The console may stay silent until it is sent a newline; nudge
+            # it once so the device prompt or the pmshell menu shows up
+            if not output.strip() and not channel.exit_status_ready():
+                channel.send('\r')
+                output += self._read_until(_CONSOLE_ATTACHED_RE, timeout=3)
+
+        except Exception as e:
+            logger.error(f"Failed to connect to console: {e}")
+            raise CommandExecutionError(f"Console connection failed: {e}")
+
+        if _CONSOLE_FAILED_RE.search(output):
+            channel.close()
+            self.channel = None
+            logger.error(f"pmshell refused console port {console_port}")
+            raise CommandExecutionError(
+                f"Console connection failed: {output.strip()[-200:]}"
+            )
+
+        # pmshell prints its error and exits, so a closed channel is a
+        # rejection even when the output matched the attach pattern. A
+        # pmshell that ignores the port argument shows its port menu
+        # instead, which device commands must not be typed into.
+        lines = output.strip().splitlines()
+        menu_shown = bool(
+            lines
+            and _PMSHELL_MENU_RE.search(lines[-1])
+            and _PMSHELL_SELECT_RE.search(lines[-1])
+        )
+        if channel.exit_status_ready() or menu_shown:
+            reason = "showed the port menu" if menu_shown else "was rejected"
+            logger.info(
+                f"'pmshell {console_port}' {reason}, falling back to interactive pmshell"
+            )
+            logger.debug(f"pmshell output: {output[:200]}")
+            channel.close()
+            self.channel = None
+            self.connect_to_console(console_port)
+            return
+
+        if not lines:
+            logger.warning(f"Console port {console_port} sent no output; assuming attached")
+
+        logger.info(f"Successfully connected to console port {console_port}")
+        logger.debug(f"Console connection output: {output[:200]}")
+
+    def open_console(self, console_port: int) -> 'ConsoleManager':
+        """
+        Open a console session on another channel of this connection.
+
+        The returned ConsoleManager shares this terminal server connection,
+        so consoles on several ports can be driven concurrently (e.g. from
+        a thread pool) with a single SSH login. Closing it closes only its
+        console channel.
+
+        Args:
+            console_port: Console port number for the device
+
+        Returns:
+            ConsoleManager attached to the device console
+
+        Raises:
+            CommandExecutionError: If not connected or console connection fails
+        """
+        if not self._connected or not self.client:
+            raise CommandExecutionError("Not connected to terminal server")
+
+        session = ConsoleManager(
+            hostname=self.hostname,
+            username=self.username,
+            password=self.password,
+            port=self.port,
+            timeout=self.timeout,
+            compress=self.compress
+        )
+        session.client = self.client
+        session._connected = True
+        session._owns_client = False
+        session.connect_to_console_direct(console_port)
+
+        return session
+
     def execute_device_command(
         self,
         command: str,
         wait_time: int = 5,
-        expect: Optional[str] = None,
+        expect: Optional[Union[str, Pattern[str]]] = None,
         timeout: int = 120,
         handle_pagination: bool = True,
-        auto_confirm: bool = False
+        auto_confirm: bool = False,
+        expect_after: Optional[str] = None
     ) -> str:
         """
         Execute command on device console.
@@ -380,10 +1094,14 @@ class ConsoleManager:
         Args:
             command: Command to execute
             wait_time: Time to wait after command (seconds)
-            expect: Expected string in output (optional)
+            expect: Expected string in output, or a compiled pattern (optional).
+                A pattern ends the read as soon as it matches; if it never
+                matches, the command falls back to waiting for wait_time.
             timeout: Command timeout in seconds
             handle_pagination: Automatically handle --More-- prompts (default: True)
             auto_confirm: Automatically confirm prompts with Enter (default: False)
+            expect_after: Only look for expect once this text, e.g. a command
+                echo, has appeared in the output (optional)
 
         Returns:
             Command output
@@ -429,64 +1147,102 @@ class ConsoleManager:
             self.channel.send('\r\n')
             time.sleep(0.5)
 
-            # Wait for output
-            start_time = time.time()
-            output = ''
+            # Wait for output. Deadlines use the monotonic clock so that wall
+            # clock adjustments cannot cut a command short or extend it.
+            now = time.monotonic()
+            deadline = now + timeout
+            idle_deadline = now + wait_time
+            # Chunks are collected in a list and joined once at the end;
+            # prompt and expect checks only look at recent output
+            output_parts = []
             pagination_count = 0
             max_pagination = 50  # Prevent infinite loops
             confirmation_sent = False
+            # Recent output for expect checks, and the part of it not yet
+            # answered by a pagination/confirmation response
+            recent = ''
+            pending = ''
+            expect_armed = expect_after is None
+            tail_size = max(
+                SCAN_TAIL_SIZE,
+                len(expect) if isinstance(expect, str) else 0,
+                len(expect_after or '')
+            )
 
             while True:
-                time.sleep(1)
+                # Wake as soon as data arrives instead of polling once a second
+                self._wait_readable(READ_WAIT_INTERVAL)
                 chunk = self._read_channel()
-                output += chunk
+                if chunk:
+                    output_parts.append(chunk)
+                expect_scan = recent + chunk
+                recent = expect_scan[-tail_size:]
+                scan = pending + chunk
+                pending = scan[-tail_size:]
 
                 # Handle pagination prompts
                 if handle_pagination and pagination_count < max_pagination:
-                    if '--More--' in chunk or '-- More --' in chunk:
+                    if _PAGINATION_RE.search(scan):
                         logger.debug("Detected pagination prompt, sending space")
                         self.channel.send(' ')
                         pagination_count += 1
-                        # Reset timer when handling pagination
-                        start_time = time.time()
+                        pending = ''
+                        # Reset timers when handling pagination
+                        now = time.monotonic()
+                        deadline = now + timeout
+                        idle_deadline = now + wait_time
                         continue
 
                 # Handle confirmation prompts (e.g., "Destination filename [...]?")
                 if auto_confirm and not confirmation_sent:
                     # Look for common confirmation patterns
-                    confirmation_patterns = [
-                        r'Destination filename \[.*?\]\?',
-                        r'\[confirm\]',
-                        r'\(y/n\)',
-                        r'\[yes/no\]',
-                    ]
-                    for pattern in confirmation_patterns:
-                        if re.search(pattern, chunk, re.IGNORECASE):
-                            logger.debug(f"Detected confirmation prompt: {pattern}, sending Enter")
+                    for pattern in _CONFIRM_PATTERNS:
+                        if pattern.search(scan):
+                            logger.debug(
+                                f"Detected confirmation prompt: {pattern.pattern}, sending Enter"
+                            )
                             self.channel.send('\n')
                             confirmation_sent = True
-                            start_time = time.time()
+                            pending = ''
+                            now = time.monotonic()
+                            deadline = now + timeout
+                            idle_deadline = now + wait_time
                             break
 
-                # Check for expected string
-                if expect and expect in output:
-                    logger.debug(f"Found expected string: {expect}")
+                # Only consider output after expect_after once it has appeared
+                if not expect_armed and expect_after in expect_scan:
+                    expect_armed = True
+                    expect_scan = expect_scan[
+                        expect_scan.rindex(expect_after) + len(expect_after):
+                    ]
+
+                # Check for expected string or pattern
+                if expect_armed and isinstance(expect, str):
+                    if expect and expect in expect_scan:
+                        logger.debug(f"Found expected string: {expect}")
+                        break
+                elif expect_armed and expect is not None and expect.search(expect_scan):
+                    logger.debug(f"Matched expected pattern: {expect.pattern}")
                     break
 
                 # Check timeout
-                if time.time() - start_time > timeout:
+                now = time.monotonic()
+                if now > deadline:
                     logger.warning(f"Command timeout after {timeout} seconds")
                     break
 
                 # If no expect string, wait for specified time
-                if not expect and time.time() - start_time > wait_time:
+                if not isinstance(expect, str) and now > idle_deadline:
                     # Check if we're still receiving data
                     if chunk:
                         # Keep waiting if data is still coming
-                        start_time = time.time()
+                        deadline = now + timeout
+                        idle_deadline = now + wait_time
                         continue
                     break
 
+            output = ''.join(output_parts)
+
             if pagination_count > 0:
                 logger.debug(f"Handled {pagination_count} pagination prompts")
             if confirmation_sent:
@@ -499,23 +1255,170 @@ class ConsoleManager:
             logger.error(f"Failed to execute device command: {e}")
             raise CommandExecutionError(f"Device command execution failed: {e}")
 
+    def execute_device_commands(self, commands: List[str], **kwargs: Any) -> str:
+        """
+        Execute several commands on the device console in one exchange.
+
+        All commands are sent back to back and the device processes them in
+        order, so only one response wait is needed instead of one per
+        command. Unless an expect value is given, reading stops at the first
+        prompt after the last command's echo.
+
+        Args:
+            commands: Commands to execute, in order
+            **kwargs: Passed through to execute_device_command()
+
+        Returns:
+            Combined output of all commands
+
+        Raises:
+            CommandExecutionError: If command execution fails
+        """
+        if 'expect' not in kwargs:
+            kwargs['expect'] = PROMPT_RE
+            kwargs.setdefault('expect_after', commands[-1])
+
+        return self.execute_device_command('\r\n'.join(commands), **kwargs)
+
+    def _fill(self) -> int:
+        """
+        Drain pending channel data into the local receive buffer.
+
+        Returns:
+            Number of bytes received
+
+        Raises:
+            CommandExecutionError: If the console channel is not established
+        """
+        channel = self.channel
+        if channel is None:
+            raise CommandExecutionError("Console channel not established")
+
+        received = 0
+        while channel.recv_ready():
+            # Take everything paramiko has queued in one call where its
+            # buffer size is known
+            try:
+                size = max(len(channel.in_buffer), RX_CHUNK_SIZE)
+            except (AttributeError, TypeError):
+                size = RX_CHUNK_SIZE
+            chunk = channel.recv(size)
+            if not chunk:
+                break
+            self._rxbuf += chunk
+            received += len(chunk)
+
+        return received
+
     def _read_channel(self) -> str:
         """
         Read available data from channel.
 
+        Data is drained in large chunks into a local buffer and decoded in
+        one step; a multi-byte character split across reads is completed
+        on the next call instead of being dropped.
+
         Returns:
             Data read from channel
         """
         output = ''
         try:
-            while self.channel.recv_ready():
-                chunk = self.channel.recv(4096)
-                output += chunk.decode('utf-8', errors='ignore')
+            self._fill()
+            if self._rxbuf:
+                output = self._decoder.decode(self._rxbuf)
+                self._rxbuf.clear()
         except Exception as e:
             logger.debug(f"Error reading channel: {e}")
 
         return output
 
+    def _read_until(self, pattern: Pattern[str], timeout: float = 5.0) -> str:
+        """
+        Read from channel until pattern matches or timeout expires.
+
+        Returns as soon as the device has answered instead of sleeping for
+        a fixed worst-case delay; waits on the channel with select() between
+        reads.
+
+        Args:
+            pattern: Compiled pattern marking the end of the response
+            timeout: Maximum time to wait in seconds (default: 5)
+
+        Returns:
+            Data read from channel (may not match pattern if timeout expired)
+        """
+        output = ''
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wait_readable(remaining)
+            chunk = self._read_channel()
+            if chunk:
+                output += chunk
+                if pattern.search(output):
+                    break
+
+        return output
+
+    def _send_and_read_until(
+        self, data: str, pattern: Pattern[str], timeout: float = 5.0
+    ) -> str:
+        """
+        Send data and read the reply until pattern matches or timeout expires.
+
+        Output already received (e.g. a prompt left over from an earlier
+        exchange) is discarded first, so the read only sees the reply to
+        this send.
+
+        Args:
+            data: Text to send, including the line terminator
+            pattern: Compiled pattern marking the end of the response
+            timeout: Maximum time to wait in seconds (default: 5)
+
+        Returns:
+            Data read after the send (may not match pattern if timeout expired)
+
+        Raises:
+            CommandExecutionError: If the console channel is not established
+        """
+        channel = self.channel
+        if channel is None:
+            raise CommandExecutionError("Console channel not established")
+        self._read_channel()
+        channel.send(data)
+        return self._read_until(pattern, timeout=timeout)
+
+    def _wait_readable(self, timeout: float) -> None:
+        """
+        Block until the channel has data to read or timeout expires.
+
+        Uses select() on the channel so the caller wakes as soon as data
+        arrives; falls back to a short sleep if the channel cannot be
+        selected on.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Raises:
+            CommandExecutionError: If the console channel is not established
+        """
+        channel = self.channel
+        if channel is None:
+            raise CommandExecutionError("Console channel not established")
+
+        if channel.recv_ready():
+            return
+        if channel.closed or channel.eof_received:
+            # A closed channel always selects as readable; avoid spinning
+            time.sleep(min(timeout, READ_POLL_INTERVAL))
+            return
+        try:
+            select.select([channel], [], [], timeout)
+        except (OSError, ValueError, TypeError):
+            time.sleep(min(timeout, READ_POLL_INTERVAL))
+
     def send_control_c(self) -> None:
         """Send Ctrl+C to console."""
         if self.channel:
@@ -535,54 +1438,99 @@ class ConsoleManager:
         """
         logger.debug("Parsing show version output for serial number")
 
-        # Clean up pagination artifacts
-        cleaned_output = output.replace('--More--', '').replace('-- More --', '')
-        # Remove backspace characters and ANSI escape codes
-        cleaned_output = re.sub(r'\x08+', '', cleaned_output)
-        cleaned_output = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', cleaned_output)
-
-        # Common patterns for serial number in show version output
-        patterns = [
-            # Cisco IOS XE / Catalyst switches
-            r'Model [Nn]umber\s*:?\s*\S+\s+[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
-            r'[Ss]ystem [Ss]erial [Nn]umber\s*:?\s*(\S+)',
-            # Standard patterns
-            r'[Ss]erial\s+[Nn]umber\s*:?\s+(\S+)',
-            r'[Pp]rocessor [Bb]oard ID\s+(\S+)',
-            r'Chassis Serial Number\s*:?\s+(\S+)',
-            # Alternative patterns
-            r'Serial [Nn]um\s*:?\s*(\S+)',
-            r'SN\s*:?\s*(\S+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, cleaned_output, re.IGNORECASE)
-            if match:
-                serial = match.group(1).strip()
-                # Filter out placeholder values
-                if serial and serial.lower() not in ['none', 'n/a', 'unknown', '']:
-                    logger.info(f"Extracted serial number using pattern '{pattern}': {serial}")
-                    return serial
+        # Remove pagination artifacts, backspace characters and ANSI codes
+        cleaned_output = _CLEAN_RE.sub('', output)
+
+        # Only the first match of each pattern counts, and the highest
+        # priority pattern with a real value wins, as if each pattern were
+        # searched for in turn.
+        first_matches: Dict[int, str] = {}
+        for start in self._serial_token_positions(cleaned_output):
+            match = _SERIAL_UNION.match(cleaned_output, start)
+            # Every alternative captures a named group, so lastgroup is set
+            # whenever the union matches
+            if not match or match.lastgroup is None:
+                continue
+            group = match.lastgroup
+            index = int(group[1:])
+            first_matches.setdefault(index, match.group(group).strip())
+            if first_matches[index].lower() not in _SERIAL_PLACEHOLDERS:
+                if index == 0:
+                    break
+                continue
+
+            # A placeholder does not end the search; lower priority patterns
+            # matching at the same position are still candidates
+            start = match.start()
+            for other in range(index + 1, len(_SERIAL_PATTERNS)):
+                other_match = _SERIAL_PATTERNS[other].match(cleaned_output, start)
+                if other_match:
+                    first_matches.setdefault(other, other_match.group(1).strip())
+
+        for index in sorted(first_matches):
+            serial = first_matches[index]
+            # Filter out placeholder values
+            if serial.lower() not in _SERIAL_PLACEHOLDERS:
+                logger.info(
+                    f"Extracted serial number using pattern "
+                    f"'{_SERIAL_PATTERN_SOURCES[index]}': {serial}"
+                )
+                return serial
 
         logger.warning("Could not extract serial number from show version output")
         logger.debug(f"Show version output (first 1000 chars): {cleaned_output[:1000]}")
 
         return None
 
+    @staticmethod
+    def _serial_token_positions(text: str) -> List[int]:
+        """
+        Find where serial number patterns could start.
+
+        Args:
+            text: Cleaned 'show version' output
+
+        Returns:
+            Sorted positions of the words in _SERIAL_TOKENS, ignoring case
+        """
+        if not text.isascii():
+            return [token.start() for token in _SERIAL_TOKEN_RE.finditer(text)]
+
+        # Plain substring searches on lowered text are much cheaper than a
+        # case-insensitive regex scan; for ASCII the positions line up
+        lowered = text.lower()
+        positions = set()
+        for token in _SERIAL_TOKENS:
+            position = lowered.find(token)
+            while position >= 0:
+                positions.add(position)
+                position = lowered.find(token, position + 1)
+
+        return sorted(positions)
+
     def close(self) -> None:
-        """Close console and SSH connections."""
+        """
+        Close console and SSH connections.
+
+        A session from open_console() closes only its console channel and
+        leaves the shared terminal server connection open.
+        """
         if self.channel:
             logger.debug("Closing console channel")
             self.channel.close()
 
-        if self.client:
+        if self.client and not self._owns_client:
+            self.client = None
+            self._connected = False
+        elif self.client:
             logger.info(f"Closing connection to terminal server {self.hostname}")
             self.client.close()
             self._connected = False
 
     def __enter__(self):
         """Context manager entry."""
-        self.connect()
+        if not self._connected:
+            self.connect()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
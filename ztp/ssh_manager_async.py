@@ -0,0 +1,184 @@
+"""
+Asynchronous SSH Connection Management
+
+This module provides an asyncio-based SSH manager built on asyncssh, for
+running commands on many hosts concurrently. asyncssh is an optional
+dependency; install it with: pip install 'zero-touch-provisioning[async]'
+"""
+
+import asyncio
+import logging
+from types import TracebackType
+from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+
+from .ssh_manager import CommandExecutionError, ConnectionError
+
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSSHManager:
+    """
+    Manages an asyncio SSH connection to a remote host.
+
+    Mirrors the SSHManager interface with coroutine methods. Each command
+    opens a new session on the single connection, so commands issued
+    concurrently on one host share its transport.
+
+    Attributes:
+        hostname (str): Target host IP or hostname
+        username (str): SSH username
+        password (str): SSH password (optional if using key)
+        port (int): SSH port (default: 22)
+        timeout (int): Connection timeout in seconds
+        conn (asyncssh.SSHClientConnection): SSH connection instance
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        username: str,
+        password: Optional[str] = None,
+        key_filename: Optional[str] = None,
+        port: int = 22,
+        timeout: int = 30
+    ):
+        """
+        Initialize async SSH manager.
+
+        Args:
+            hostname: Target host IP or hostname
+            username: SSH username
+            password: SSH password (optional)
+            key_filename: Path to SSH private key (optional)
+            port: SSH port (default: 22)
+            timeout: Connection timeout in seconds (default: 30)
+        """
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.key_filename = key_filename
+        self.port = port
+        self.timeout = timeout
+        self.conn: Any = None
+
+    async def connect(self) -> None:
+        """
+        Establish SSH connection.
+
+        Raises:
+            ConnectionError: If asyncssh is not installed or connection fails
+        """
+        if asyncssh is None:
+            raise ConnectionError(
+                "asyncssh is not installed. "
+                "Install with: pip install 'zero-touch-provisioning[async]'"
+            )
+
+        logger.info(f"Connecting to {self.hostname}:{self.port} as {self.username}")
+
+        try:
+            # Use only the configured key, as SSHManager does; None would make
+            # asyncssh also try ~/.ssh keys and the SSH agent
+            self.conn = await asyncssh.connect(
+                self.hostname,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                client_keys=[self.key_filename] if self.key_filename else [],
+                agent_path=None,
+                known_hosts=None,
+                connect_timeout=self.timeout,
+            )
+            logger.info(f"Successfully connected to {self.hostname}")
+
+        except asyncssh.PermissionDenied as e:
+            logger.error(f"Authentication failed for {self.hostname}: {e}")
+            raise ConnectionError(f"Authentication failed: {e}")
+
+        except (OSError, asyncssh.Error, asyncio.TimeoutError) as e:
+            logger.error(f"Error connecting to {self.hostname}: {e}")
+            raise ConnectionError(f"Connection failed: {e}")
+
+    async def execute_command(self, command: str, timeout: int = 60) -> Tuple[str, str, int]:
+        """
+        Execute command on remote host.
+
+        Args:
+            command: Command to execute
+            timeout: Command timeout in seconds (default: 60)
+
+        Returns:
+            Tuple of (stdout, stderr, exit_code)
+
+        Raises:
+            CommandExecutionError: If command execution fails
+        """
+        if self.conn is None:
+            raise CommandExecutionError("Not connected. Call connect() first.")
+
+        logger.debug("Executing command on %s: %s", self.hostname, command)
+
+        try:
+            result = await self.conn.run(command, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            raise CommandExecutionError(f"Failed to execute command: {e}")
+
+        logger.debug("Command exit code: %s", result.exit_status)
+        return result.stdout or '', result.stderr or '', result.exit_status
+
+    async def close(self) -> None:
+        """Close SSH connection."""
+        if self.conn is not None:
+            logger.info(f"Closing connection to {self.hostname}")
+            self.conn.close()
+            await self.conn.wait_closed()
+            self.conn = None
+
+    async def __aenter__(self) -> 'AsyncSSHManager':
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
+async def run_on_hosts(
+    hosts: Sequence[AsyncSSHManager],
+    command: str,
+    timeout: int = 60
+) -> List[Union[Tuple[str, str, int], BaseException]]:
+    """
+    Run a command on several hosts concurrently.
+
+    Hosts that are not connected yet are connected first. A failure on one
+    host does not affect the others.
+
+    Args:
+        hosts: Async SSH managers for the target hosts
+        command: Command to execute on every host
+        timeout: Command timeout in seconds (default: 60)
+
+    Returns:
+        One entry per host, in order: a (stdout, stderr, exit_code) tuple,
+        or the exception raised for that host
+    """
+    async def run(host: AsyncSSHManager) -> Tuple[str, str, int]:
+        if host.conn is None:
+            await host.connect()
+        return await host.execute_command(command, timeout=timeout)
+
+    return await asyncio.gather(*(run(host) for host in hosts), return_exceptions=True)